@@ -1,12 +1,431 @@
+import os  # For the number of CPU cores
+import time  # For the model search time budget
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED  # For running the model search across processes
+import numpy as np  # For aggregating cross-validation scores
 import pandas as pd  # Import pandas for data manipulation and analysis
-from sklearn.model_selection import train_test_split  # For splitting data into train and test sets
-from sklearn.preprocessing import OneHotEncoder, StandardScaler  # For encoding categorical variables and scaling numerical features
+from sklearn.base import clone  # For creating unfitted copies of candidate estimators
+from sklearn.model_selection import train_test_split, StratifiedKFold, ParameterGrid  # For splitting data, CV folds and hyperparameter grids
+from sklearn.preprocessing import OneHotEncoder, StandardScaler, FunctionTransformer  # For encoding, scaling and the schema step
 from sklearn.impute import SimpleImputer  # For handling missing values
-from sklearn.linear_model import LogisticRegression  # The machine learning model used for classification
+from sklearn.linear_model import LogisticRegression, SGDClassifier  # Classifiers (SGD for incremental/streaming training)
+from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier  # Extra candidates for the model search
 from sklearn.metrics import accuracy_score, classification_report, confusion_matrix  # For evaluating model performance
 from sklearn.compose import ColumnTransformer  # For applying different preprocessing to different columns
 from sklearn.pipeline import Pipeline  # For chaining preprocessing and modeling steps
-import joblib  # For saving and loading trained models
+from model_registry import get_registry, file_fingerprint  # Content-addressed model store
+from data_cache import cache_key  # Keys for cached preprocessing output
+import instrumentation  # Stage timings and training counters
+from loan_schema import read_loans, coerce_loans, to_labels  # Compact dtypes and category labels for the loan columns
+
+# Candidate estimators for the model search: (name, estimator, hyperparameter grid)
+DEFAULT_CANDIDATES = [
+    ("logistic_regression", LogisticRegression(max_iter=1000, class_weight="balanced"), {"C": [0.01, 0.1, 1.0, 10.0]}),
+    ("random_forest", RandomForestClassifier(n_estimators=200, class_weight="balanced", random_state=42), {"max_depth": [4, 8, None], "min_samples_leaf": [1, 5]}),
+    ("gradient_boosting", GradientBoostingClassifier(random_state=42), {"learning_rate": [0.05, 0.1], "max_depth": [2, 3]}),
+]
+
+
+def profile_columns(value_counts, n_rows, max_categories=50, id_ratio=0.9):
+    # Decide how each categorical column is encoded from its value counts:
+    #   - identifier-like (almost every row unique, e.g. Loan_ID): dropped
+    #   - high-cardinality (more than max_categories values): one-hot of the max_categories
+    #     most frequent values only, everything else encodes as all zeros
+    #   - otherwise: regular one-hot encoding
+    cat_cols, capped, dropped = [], {}, []
+    report = {}
+    for col, counts in value_counts.items():
+        unique = int(len(counts))  # Distinct non-missing values
+        non_null = int(counts.sum())
+        ratio = unique / non_null if non_null else 0.0
+        if unique > max_categories and ratio >= id_ratio:
+            action = "dropped (identifier-like)"
+            dropped.append(col)
+        elif unique > max_categories:
+            action = f"one-hot capped to top {max_categories}"
+            top = counts.sort_values(ascending=False, kind="stable").index[:max_categories]
+            capped[col] = sorted(top)
+        else:
+            action = "one-hot"
+            cat_cols.append(col)
+        report[col] = {"unique": unique, "unique_ratio": round(ratio, 4), "action": action}
+    profile = {
+        "rows": int(n_rows),  # Rows the profile was computed on
+        "dropped": dropped,  # Identifier-like columns left out of the model
+        "capped": list(capped),  # High-cardinality columns with a capped one-hot width
+        "columns": report,  # Per-column statistics and decision
+    }
+    return cat_cols, capped, profile
+
+
+def build_preprocessor(num_cols, cat_cols, capped=None):
+    # Pipeline for numerical columns: impute missing values with mean, then scale
+    num_pipeline = Pipeline(
+        [("imputer", SimpleImputer(strategy="mean")), ("scale", StandardScaler())]
+    )
+    # Pipeline for categorical columns: impute missing values with most frequent, then one-hot encode
+    cat_pipeline = Pipeline(
+        [
+            ("imputer", SimpleImputer(strategy="most_frequent")),
+            ("onehot", OneHotEncoder(handle_unknown="ignore")),
+        ]
+    )
+
+    transformers = [("num", num_pipeline, num_cols), ("cat", cat_pipeline, cat_cols)]
+    if capped:  # High-cardinality columns: fixed vocabulary of their most frequent values
+        transformers.append((
+            "cat_capped",
+            Pipeline(
+                [
+                    ("imputer", SimpleImputer(strategy="most_frequent")),
+                    ("onehot", OneHotEncoder(categories=list(capped.values()), handle_unknown="ignore")),
+                ]
+            ),
+            list(capped),
+        ))
+
+    # Combine numerical and categorical pipelines into a single preprocessor
+    return ColumnTransformer(transformers)
+
+
+def schema_step(X):
+    # First step of every saved pipeline: loan columns given as numeric codes (or another
+    # accepted spelling) become the labels training read them as (Gender 1 -> "Male"), so the
+    # model accepts the same raw rows as its training file, in either form
+    return FunctionTransformer(to_labels).fit(X)
+
+
+_folds = None  # Preprocessed CV folds, set once per worker process by _init_search_worker
+
+
+def _init_search_worker(folds):
+    global _folds
+    _folds = folds  # Each worker receives the transformed folds once instead of with every task
+
+
+def _score_candidate(candidate_id, estimator, fold_id):
+    # Fit one candidate on one preprocessed fold and return its validation accuracy
+    X_fit, y_fit, X_val, y_val = _folds[fold_id]
+    start = time.perf_counter()
+    model = clone(estimator).fit(X_fit, y_fit)
+    return candidate_id, fold_id, accuracy_score(y_val, model.predict(X_val)), time.perf_counter() - start
+
+
+def _stop_workers(pool):
+    # Kill a ProcessPoolExecutor's workers (Python 3.14 has terminate_workers for this)
+    terminate = getattr(pool, "terminate_workers", None)
+    if terminate is not None:
+        terminate()
+        return
+    for proc in list((pool._processes or {}).values()):
+        proc.kill()
+    for proc in list((pool._processes or {}).values()):
+        proc.join()
+
+
+def search_models(
+    X,  # Training features
+    y,  # Training target
+    preprocessor,  # Unfitted preprocessor, cloned and fitted once per fold
+    candidates=None,  # (name, estimator, grid) tuples; DEFAULT_CANDIDATES if None
+    cv=5,  # Number of cross-validation folds
+    time_budget=None,  # Seconds of search; fits still running when it runs out are stopped
+    prune_margin=0.05,  # Drop candidates whose mean CV accuracy trails the best by more than this
+    n_jobs=None,  # Worker processes (default: all CPU cores)
+    progress=None,  # Callback, told "fitting" before every round (lets a background job stop between folds)
+):
+    start = time.perf_counter()
+    # Expand every hyperparameter grid into concrete estimators
+    configs = []
+    for name, estimator, grid in candidates or DEFAULT_CANDIDATES:
+        for params in ParameterGrid(grid or {}):
+            configs.append((name, params, clone(estimator).set_params(**params)))
+
+    # Fit the preprocessing once per fold; every candidate reuses the transformed matrices
+    folds = []
+    for fit_idx, val_idx in StratifiedKFold(n_splits=cv, shuffle=True, random_state=42).split(X, y):
+        prep = clone(preprocessor)
+        X_fit = prep.fit_transform(X.iloc[fit_idx], y.iloc[fit_idx])
+        folds.append((X_fit, y.iloc[fit_idx].to_numpy(), prep.transform(X.iloc[val_idx]), y.iloc[val_idx].to_numpy()))
+
+    scores = {i: [] for i in range(len(configs))}  # Validation accuracy per candidate and fold
+    fit_times = {i: [] for i in range(len(configs))}
+    status = {i: "complete" for i in range(len(configs))}
+    alive = list(range(len(configs)))  # Candidates still being evaluated
+    timed_out = False
+    pool = ProcessPoolExecutor(
+        max_workers=n_jobs or os.cpu_count(), initializer=_init_search_worker, initargs=(folds,)
+    )
+    try:
+        for fold_id in range(cv):  # One round per fold, pruning weak candidates in between
+            _report(progress, "fitting")
+            pending = {pool.submit(_score_candidate, i, configs[i][2], fold_id) for i in alive}
+            while pending:
+                remaining = None if time_budget is None else time_budget - (time.perf_counter() - start)
+                if remaining is not None and remaining <= 0:
+                    timed_out = True
+                    break
+                done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+                for future in done:
+                    i, _, score, seconds = future.result()
+                    scores[i].append(score)
+                    fit_times[i].append(seconds)
+            if timed_out:  # Fits that haven't started yet are cancelled on shutdown below
+                for i in alive:
+                    if len(scores[i]) < cv:
+                        status[i] = "timed out"
+                break
+            if fold_id == cv - 1:  # Every survivor is fully scored; nothing left to save by pruning
+                break
+            # Early stopping: keep candidates within prune_margin of the current best mean
+            best = max(np.mean(scores[i]) for i in alive)
+            for i in alive:
+                if np.mean(scores[i]) < best - prune_margin:
+                    status[i] = "pruned"
+            alive = [i for i in alive if status[i] == "complete"]
+    finally:
+        if timed_out:  # Stop fits that are still running so the budget is a real limit
+            _stop_workers(pool)
+        pool.shutdown(wait=not timed_out, cancel_futures=True)
+
+    rows = {}
+    for i, (name, params, _) in enumerate(configs):
+        if not scores[i]:  # Never finished a single fold within the budget
+            continue
+        rows[i] = {
+            "model": name,  # Candidate family
+            "params": params,  # Hyperparameters of this configuration
+            "mean_accuracy": float(np.mean(scores[i])),  # Mean CV accuracy over evaluated folds
+            "std_accuracy": float(np.std(scores[i])),  # Spread across folds
+            "folds": len(scores[i]),  # Folds evaluated before finishing, pruning or timeout
+            "mean_fit_time": float(np.mean(fit_times[i])),  # Seconds per fit
+            "status": status[i],  # complete, pruned or timed out
+        }
+    if not rows:
+        raise ValueError("Model search time budget ran out before any candidate finished a fold")
+    # Fully evaluated candidates rank ahead of partial ones, then by mean accuracy
+    ranking = sorted(rows, key=lambda i: (rows[i]["folds"], rows[i]["mean_accuracy"]), reverse=True)
+    return clone(configs[ranking[0]][2]), [rows[i] for i in ranking]
+
+
+def _fixed_width(values):
+    # Object array of all-str or all-number values as a fixed-width "<U"/numeric array; other arrays as is
+    if values.dtype != object:
+        return values
+    items = values.tolist()
+    if all(isinstance(v, str) for v in items):
+        return np.array(items, dtype=str)
+    if all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in items):
+        return np.array(items)
+    return values
+
+
+def mmap_friendly(estimator):
+    # joblib can only memory-map arrays with a fixed item size. Fitted one-hot category tables and
+    # categorical imputer fill values are object arrays, which would still be unpickled per process,
+    # so they are converted in place (transform results are unchanged).
+    if isinstance(estimator, Pipeline):
+        for _, step in estimator.steps:
+            mmap_friendly(step)
+    elif isinstance(estimator, ColumnTransformer):
+        for _, transformer, _ in getattr(estimator, "transformers_", []):
+            if not isinstance(transformer, str):  # Skip "drop" and "passthrough"
+                mmap_friendly(transformer)
+    elif isinstance(estimator, OneHotEncoder) and hasattr(estimator, "categories_"):
+        estimator.categories_ = [_fixed_width(c) for c in estimator.categories_]
+    elif isinstance(estimator, SimpleImputer) and hasattr(estimator, "statistics_"):
+        estimator.statistics_ = _fixed_width(estimator.statistics_)
+    return estimator
+
+
+def save_model(pipeline, model_name, metrics, feature_schema, data_paths, mmap=False, data_fingerprint=None):
+    # Store the pipeline once in the model registry, with its metadata, and record where it went
+    if mmap:
+        mmap_friendly(pipeline)
+    entry = get_registry().save(
+        model_name, pipeline, metrics=dict(metrics), feature_schema=feature_schema,
+        data_fingerprint=data_fingerprint or file_fingerprint(*data_paths),  # Which training data produced this model
+        mmap=mmap,  # Load with memory-mapped arrays, shared across worker processes
+    )
+    metrics["model_path"] = entry["path"]  # Store the model path in metrics
+    metrics["model_hash"] = entry["hash"]  # Content hash of the saved pipeline
+    return entry
+
+
+def evaluate_predictions(y_test, y_pred):
+    metrics = {}  # Dictionary to store evaluation metrics
+    if y_test is not None:  # If test labels are available
+        metrics["accuracy"] = accuracy_score(y_test, y_pred)  # Accuracy score
+        metrics["classification_report"] = classification_report(
+            y_test, y_pred, output_dict=True  # Detailed classification metrics as a dictionary
+        )
+        metrics["confusion_matrix"] = confusion_matrix(y_test, y_pred).tolist()  # Confusion matrix as a list
+    else:  # If no test labels are available
+        metrics["accuracy"] = None
+        metrics["classification_report"] = None
+        metrics["confusion_matrix"] = None
+    return metrics
+
+
+def _report(progress, stage):
+    # Tell the caller (e.g. a background training job) which stage starts next
+    if progress is not None:
+        progress(stage)
+
+
+def _value_counts(s):
+    # Counts of the values present in a column, indexed by plain values (categorical columns
+    # would also list unseen categories, with a categorical index that can't be sorted)
+    counts = s.value_counts()
+    counts = counts[counts > 0]
+    counts.index = counts.index.astype(object)
+    return counts
+
+
+def _holdout_masks(path, chunksize, dtype, test_size):
+    # Yield (chunk, holdout_mask) pairs; the same seed gives the same split on every pass
+    rng = np.random.default_rng(42)
+    for chunk in pd.read_csv(path, chunksize=chunksize, dtype=dtype):
+        yield coerce_loans(chunk), rng.random(len(chunk)) < test_size
+
+
+def stream_train_model(
+    train_path=None,  # Training CSV, streamed in chunks (optional)
+    test_path=None,   # Test CSV, streamed for evaluation (optional)
+    full_path=None,   # Single CSV; a holdout split is drawn on the fly (optional)
+    target_column=None,  # Name of the target column to predict (required)
+    model_name=None,     # Name to use when saving the trained model (optional)
+    chunksize=100_000,   # Rows read per chunk; bounds memory use
+    epochs=5,            # Passes of partial_fit over the training rows
+    test_size=0.2,       # Holdout fraction when full_path is used
+    profile=True,        # Drop identifier-like and cap high-cardinality categorical columns
+    max_categories=50,   # Largest one-hot width per categorical column when profiling
+    mmap=False,          # Save for memory-mapped loading
+    progress=None,       # Callback receiving the name of each stage as it starts (optional)
+):
+    if full_path:  # Holdout rows are picked per chunk from the same file
+        data_path = full_path
+    elif train_path and test_path:
+        data_path = train_path
+        test_size = 0.0  # The test file is the holdout
+    else:
+        raise ValueError("Need either full_path or both train_path and test_path")  # Require at least one data source
+    instrumentation.inc("loan_training_runs_total", mode="streaming")
+    laps = instrumentation.stages("loan_training_stage_seconds", mode="streaming")  # Time per stage
+    _report(progress, "loading")
+
+    def training_chunks(epoch_rng=None):
+        # Training rows of each chunk (features, target), optionally shuffled
+        for chunk, holdout in _holdout_masks(data_path, chunksize, dtype, test_size):
+            chunk = chunk[~holdout & chunk[target_column].notna()]
+            if epoch_rng is not None:
+                chunk = chunk.iloc[epoch_rng.permutation(len(chunk))]
+            yield chunk.drop(columns=[target_column]), chunk[target_column]
+
+    # Column types come from the first chunk; categorical columns are then always read as strings
+    head = coerce_loans(pd.read_csv(data_path, nrows=min(chunksize, 10_000))).drop(columns=[target_column])
+    cat_cols = head.select_dtypes(include=["object", "category", "string"]).columns.tolist()  # List of categorical columns
+    num_cols = head.select_dtypes(include=["number"]).columns.tolist()  # List of numerical columns
+    dtype = {c: str for c in cat_cols}
+
+    # Pass 1: imputation means, scaler statistics, most frequent values, one-hot vocabularies and class counts
+    n_rows = 0
+    num_count = np.zeros(len(num_cols))  # Non-missing values per numeric column
+    num_mean = np.zeros(len(num_cols))   # Running mean of non-missing values
+    num_m2 = np.zeros(len(num_cols))     # Running sum of squared deviations (Chan et al. merge)
+    cat_counts = [pd.Series(dtype="int64") for _ in cat_cols]  # Value counts per categorical column
+    class_counts = pd.Series(dtype="int64")
+    for X, y in training_chunks():
+        n_rows += len(X)
+        values = X[num_cols].to_numpy(dtype=float)
+        n = (~np.isnan(values)).sum(axis=0)
+        mean = np.where(n > 0, np.nansum(values, axis=0) / np.maximum(n, 1), 0.0)
+        m2 = np.nansum((values - mean) ** 2, axis=0)
+        total = num_count + n
+        delta = mean - num_mean
+        num_mean = num_mean + delta * np.where(total > 0, n / np.maximum(total, 1), 0.0)
+        num_m2 = num_m2 + m2 + delta ** 2 * np.where(total > 0, num_count * n / np.maximum(total, 1), 0.0)
+        num_count = total
+        for j, col in enumerate(cat_cols):
+            cat_counts[j] = cat_counts[j].add(_value_counts(X[col]), fill_value=0)
+        class_counts = class_counts.add(_value_counts(y), fill_value=0)
+    if n_rows == 0:
+        raise ValueError("No training rows with a target value were found")
+    _report(progress, "preprocessing")
+
+    # Fit the preprocessor on a two-row prototype that reproduces the streamed statistics:
+    # mean -/+ std gives the same imputation mean, scaler mean and scaler variance, because
+    # mean-imputed values add nothing to the sum of squared deviations
+    std = np.sqrt(num_m2 / n_rows)
+    prototype = pd.DataFrame({col: [num_mean[j] - std[j], num_mean[j] + std[j]] for j, col in enumerate(num_cols)})
+    if profile:  # Drop identifier-like columns and cap high-cardinality ones
+        kept, capped, column_profile = profile_columns(dict(zip(cat_cols, cat_counts)), n_rows, max_categories)
+    else:
+        kept, capped, column_profile = cat_cols, {}, None
+    vocabularies = []
+    for j, col in enumerate(cat_cols):
+        counts = cat_counts[j]
+        top = counts[counts == counts.max()].index.min()  # Most frequent value, smallest on ties like SimpleImputer
+        prototype[col] = [top, top]
+        if col in kept:
+            vocabularies.append(sorted(counts.index))
+    preprocessor = build_preprocessor(num_cols, kept, capped)
+    if kept:
+        preprocessor.set_params(cat__onehot__categories=vocabularies)  # Full vocabulary from pass 1
+    preprocessor.fit(prototype[num_cols + kept + list(capped)])
+    laps.lap("load")  # Pass 1 over the data plus fitting the preprocessor
+    _report(progress, "fitting")
+
+    # Passes 2..: incremental training; "balanced" class weights computed from the pass-1 counts
+    classes = np.array(sorted(class_counts.index))
+    class_weight = {c: n_rows / (len(classes) * class_counts[c]) for c in classes}
+    classifier = SGDClassifier(loss="log_loss", class_weight=class_weight, random_state=42)
+    epoch_rng = np.random.default_rng(0)
+    for _ in range(epochs):
+        for X, y in training_chunks(epoch_rng):
+            if len(X):
+                classifier.partial_fit(preprocessor.transform(X), y.to_numpy(), classes=classes)
+
+    pipeline = Pipeline([("schema", schema_step(head)), ("prep", preprocessor), ("clf", classifier)])  # Same layout as auto_train_model
+    laps.lap("fit")
+    _report(progress, "evaluating")
+
+    # Evaluate on the holdout rows (or the test file), one chunk at a time
+    y_true, y_pred = [], []
+    if full_path:
+        for chunk, holdout in _holdout_masks(full_path, chunksize, dtype, test_size):
+            chunk = chunk[holdout & chunk[target_column].notna()]
+            if len(chunk):
+                y_true.append(chunk[target_column].to_numpy())
+                y_pred.append(pipeline.predict(chunk.drop(columns=[target_column])))
+    elif target_column in pd.read_csv(test_path, nrows=0).columns:
+        for chunk in pd.read_csv(test_path, chunksize=chunksize, dtype=dtype):
+            chunk = coerce_loans(chunk)
+            chunk = chunk[chunk[target_column].notna()]
+            y_true.append(chunk[target_column].to_numpy())
+            y_pred.append(pipeline.predict(chunk.drop(columns=[target_column])))
+    has_labels = bool(y_true) and sum(len(y) for y in y_true) > 0
+    metrics = evaluate_predictions(
+        np.concatenate(y_true) if has_labels else None,
+        np.concatenate(y_pred) if has_labels else None,
+    )
+    if column_profile is not None:  # What was done with each categorical column
+        metrics["column_profile"] = column_profile
+    metrics["streaming"] = {
+        "training_rows": int(n_rows),  # Rows used for fitting
+        "holdout_rows": int(sum(len(y) for y in y_true)),  # Rows used for evaluation
+        "epochs": epochs,
+        "chunksize": chunksize,
+    }
+    laps.lap("evaluate")
+
+    # Save model
+    if model_name:  # If a model name is provided
+        _report(progress, "saving")
+        schema = {c: ("str" if c in dtype else str(t)) for c, t in head.dtypes.items()}  # Input columns as read
+        save_model(pipeline, model_name, metrics, schema, [p for p in (full_path, train_path) if p], mmap)
+        laps.lap("dump")
+
+    return pipeline, metrics
 
 
 def auto_train_model(
@@ -14,19 +433,51 @@ def auto_train_model(
     test_path=None,   # Path to the test data CSV file (optional)
     full_path=None,   # Path to a single CSV file containing all data (optional)
     target_column=None,  # Name of the target column to predict (required)
-    model_name=None      # Name to use when saving the trained model (optional)
+    model_name=None,     # Name to use when saving the trained model (optional)
+    search=False,        # Run a cross-validated search over several estimators instead of one logistic regression
+    cv=5,                # Number of cross-validation folds for the search
+    time_budget=None,    # Seconds allowed for the search (optional)
+    n_jobs=None,         # Worker processes for the search (default: all CPU cores)
+    candidates=None,     # Custom (name, estimator, grid) candidates for the search (optional)
+    streaming=False,     # Train out-of-core: stream the CSV in chunks and fit an incremental linear model
+    chunksize=100_000,   # Rows per chunk in streaming mode
+    epochs=5,            # Passes over the data in streaming mode
+    profile=True,        # Drop identifier-like and cap high-cardinality categorical columns
+    max_categories=50,   # Largest one-hot width per categorical column when profiling
+    mmap=False,          # Save the model for memory-mapped loading (shared across worker processes)
+    cache=None,          # TrainingCache reusing parsed data and fitted preprocessing across runs (optional)
+    progress=None        # Callback receiving the name of each stage as it starts (optional)
 ):
+    if streaming:  # Datasets larger than memory
+        return stream_train_model(
+            train_path=train_path, test_path=test_path, full_path=full_path, target_column=target_column,
+            model_name=model_name, chunksize=chunksize, epochs=epochs, profile=profile,
+            max_categories=max_categories, mmap=mmap, progress=progress,
+        )
+
+    instrumentation.inc("loan_training_runs_total", mode="search" if search else "standard")
+    laps = instrumentation.stages("loan_training_stage_seconds", mode="search" if search else "standard")  # Time per stage
+    _report(progress, "loading")
+
     # Load data
+    read_csv = read_loans  # Loan columns load as categories and float32
+    fingerprints = {}  # Content hash per input file (only computed when caching)
+    if cache is not None:  # Parsed frames are reused across runs
+        fingerprints = {p: file_fingerprint(p) for p in (full_path, train_path, test_path) if p}
+        read_csv = lambda path: cache.read_csv(path, fingerprints[path], reader=read_loans)  # noqa: E731
     if full_path:  # If a single full dataset is provided
-        df = pd.read_csv(full_path)  # Read the CSV file into a DataFrame
+        df = read_csv(full_path)  # Read the CSV file into a DataFrame
+        laps.lap("load")
         X = df.drop(columns=[target_column])  # Features: all columns except the target
         y = df[target_column]  # Target: the column to predict
         X_train, X_test, y_train, y_test = train_test_split(
             X, y, test_size=0.2, random_state=42  # Split data into train/test (80/20 split)
         )
+        laps.lap("split")
     elif train_path and test_path:  # If separate train and test files are provided
-        train_df = pd.read_csv(train_path)  # Read training data
-        test_df = pd.read_csv(test_path)    # Read test data
+        train_df = read_csv(train_path)  # Read training data
+        test_df = read_csv(test_path)    # Read test data
+        laps.lap("load")
         X_train = train_df.drop(columns=[target_column])  # Training features
         y_train = train_df[target_column]  # Training target
         if target_column in test_df.columns:  # If test data includes target column
@@ -35,58 +486,85 @@ def auto_train_model(
         else:  # If test data does not include target column (e.g., for prediction only)
             X_test = test_df  # Test features only
             y_test = None     # No test target available
+        laps.lap("split")
     else:
         raise ValueError("Need either full_path or both train_path and test_path")  # Require at least one data source
 
-    # Preprocessing
-    cat_cols = X_train.select_dtypes(include=["object", "category"]).columns.tolist()  # List of categorical columns
-    num_cols = X_train.select_dtypes(include=["number"]).columns.tolist()  # List of numerical columns
+    _report(progress, "preprocessing")
 
-    # Pipeline for numerical columns: impute missing values with mean, then scale
-    num_pipeline = Pipeline(
-        [("imputer", SimpleImputer(strategy="mean")), ("scale", StandardScaler())]
-    )
-    # Pipeline for categorical columns: impute missing values with most frequent, then one-hot encode
-    cat_pipeline = Pipeline(
-        [
-            ("imputer", SimpleImputer(strategy="most_frequent")),
-            ("onehot", OneHotEncoder(handle_unknown="ignore")),
-        ]
-    )
+    # Preprocessing: the fitted preprocessor and the transformed matrices only depend on the
+    # data, the target column and the profiling settings, so they are cached together
+    prep_key = None
+    cached = None
+    if cache is not None:
+        prep_key = cache_key(
+            "preprocessing", [fingerprints[p] for p in (full_path, train_path, test_path) if p],
+            target_column, profile, max_categories, [str(t) for t in X_train.dtypes],
+        )
+        cached = cache.get(prep_key)
+    if cached is not None:
+        preprocessor, cat_cols, num_cols, column_profile, Xt_train, Xt_test = cached
+    else:
+        cat_cols = X_train.select_dtypes(include=["object", "category"]).columns.tolist()  # List of categorical columns
+        num_cols = X_train.select_dtypes(include=["number"]).columns.tolist()  # List of numerical columns
 
-    # Combine numerical and categorical pipelines into a single preprocessor
-    preprocessor = ColumnTransformer(
-        [("num", num_pipeline, num_cols), ("cat", cat_pipeline, cat_cols)]
-    )
+        # Column profiling: identifier-like columns (e.g. Loan_ID) would add one one-hot column per row
+        column_profile = None
+        capped = {}
+        if profile:
+            cat_cols, capped, column_profile = profile_columns(
+                {c: _value_counts(X_train[c]) for c in cat_cols}, len(X_train), max_categories
+            )
+
+        preprocessor = build_preprocessor(num_cols, cat_cols, capped)  # Imputation, scaling and one-hot encoding
+        Xt_train = preprocessor.fit_transform(X_train, y_train)  # Same as the first step of Pipeline.fit
+        Xt_test = preprocessor.transform(X_test)
+        if cache is not None:
+            cache.put(prep_key, (preprocessor, cat_cols, num_cols, column_profile, Xt_train, Xt_test))
+    laps.lap("preprocess")
+    _report(progress, "fitting")
+
+    # Choose the classifier: a cross-validated search, or the default logistic regression
+    leaderboard = None
+    if search:
+        classifier, leaderboard = search_models(
+            X_train, y_train, clone(preprocessor),  # Each fold fits its own unfitted copy
+            candidates=candidates, cv=cv, time_budget=time_budget, n_jobs=n_jobs, progress=progress,
+        )
+        laps.lap("search")
+    else:
+        classifier = LogisticRegression(max_iter=1000, class_weight="balanced")  # Classifier with balanced class weights and increased max iterations
 
-    # Full pipeline: preprocessing followed by logistic regression classifier
+    # Train: the preprocessor is already fitted, only the classifier is fitted here
+    classifier.fit(Xt_train, y_train)
+    laps.lap("fit")
+    _report(progress, "evaluating")
+
+    # Full pipeline: category labels, preprocessing, then the classifier
     pipeline = Pipeline(
         [
+            ("schema", schema_step(X_train)),  # Numeric codes -> category labels
             ("prep", preprocessor),  # Preprocessing step
-            ("clf", LogisticRegression(max_iter=1000, class_weight="balanced")),  # Classifier with balanced class weights and increased max iterations
+            ("clf", classifier),  # Classifier step
         ]
     )
 
-    # Train
-    pipeline.fit(X_train, y_train)  # Fit the pipeline on the training data
-
     # Evaluate
-    metrics = {}  # Dictionary to store evaluation metrics
-    if y_test is not None:  # If test labels are available
-        y_pred = pipeline.predict(X_test)  # Predict on the test set
-        metrics["accuracy"] = accuracy_score(y_test, y_pred)  # Accuracy score
-        metrics["classification_report"] = classification_report(
-            y_test, y_pred, output_dict=True  # Detailed classification metrics as a dictionary
-        )
-        metrics["confusion_matrix"] = confusion_matrix(y_test, y_pred).tolist()  # Confusion matrix as a list
-    else:  # If no test labels are available
-        metrics["accuracy"] = None
-        metrics["classification_report"] = None
-        metrics["confusion_matrix"] = None
+    metrics = evaluate_predictions(y_test, classifier.predict(Xt_test) if y_test is not None else None)
+    laps.lap("evaluate")
+
+    if column_profile is not None:  # What was done with each categorical column
+        metrics["column_profile"] = column_profile
+    if leaderboard is not None:  # Model search results, best candidate first
+        metrics["leaderboard"] = leaderboard
 
     # Save model
     if model_name:  # If a model name is provided
-        joblib.dump(pipeline, f"{model_name}.pkl")  # Save the trained pipeline to a file
-        metrics["model_path"] = f"{model_name}.pkl"  # Store the model path in metrics
+        _report(progress, "saving")
+        schema = {c: str(t) for c, t in X_train.dtypes.items()}  # Input columns and their dtypes
+        data_paths = [p for p in (full_path, train_path) if p]
+        data_fingerprint = fingerprints.get(data_paths[0]) if len(data_paths) == 1 else None  # Reuse the cache's hash
+        save_model(pipeline, model_name, metrics, schema, data_paths, mmap, data_fingerprint)
+        laps.lap("dump")
 
     return pipeline, metrics  # Return the trained pipeline and
\ No newline at end of file
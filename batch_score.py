@@ -0,0 +1,161 @@
+import argparse  # For the command-line interface
+import time  # For measuring scoring throughput
+from model_registry import load_model  # For loading the model by registry name or file path
+import numpy as np  # For vectorized argmax over the probability matrix
+import pandas as pd  # For reading and writing chunks of applications
+from sklearn.compose import ColumnTransformer  # For finding the categorical columns of a saved pipeline
+from sklearn.pipeline import Pipeline  # For unwrapping saved pipelines
+
+
+def _pipeline_columns(model, categorical):
+    # Input columns of the saved pipeline's categorical ("cat", "cat_capped") or numeric
+    # ("num") transformers; columns it drops (e.g. Loan_ID) are in neither list
+    if not isinstance(model, Pipeline):  # Bare estimators (e.g. model.pkl) take numeric codes only
+        return []
+    for step in model.named_steps.values():  # Look for the preprocessing step
+        if isinstance(step, ColumnTransformer):
+            return [  # Fitted transformers with their column lists
+                col for name, _, cols in step.transformers_
+                if name != "remainder" and name.startswith("cat") == categorical for col in cols
+            ]
+    return []
+
+
+def categorical_columns(model):
+    # Columns the saved pipeline one-hot encodes; these must always be read as strings,
+    # otherwise a chunk without e.g. "3+" in Dependents is parsed as integers and the
+    # encoder silently treats every value as unknown
+    return _pipeline_columns(model, categorical=True)
+
+
+def numeric_columns(model):
+    # Columns the saved pipeline imputes and scales; these are always read as float64, so a
+    # column that looks like integers in one chunk and has decimals (or gaps) in the next
+    # keeps the same type in every chunk, and in the Parquet output
+    return _pipeline_columns(model, categorical=False)
+
+
+def iter_chunks(input_path, chunksize, dtype=None):
+    # Yield the input file as DataFrames of at most `chunksize` rows
+    if input_path.endswith(".parquet"):  # Parquet input is read batch by batch
+        import pyarrow.parquet as pq  # Optional dependency, only needed for Parquet files
+        parquet_file = pq.ParquetFile(input_path)
+        for batch in parquet_file.iter_batches(batch_size=chunksize):
+            chunk = batch.to_pandas()
+            for col, t in (dtype or {}).items():  # Apply the same dtype overrides as for CSV input
+                if col in chunk.columns:  # Missing values stay missing, as read_csv keeps them
+                    chunk[col] = chunk[col].where(chunk[col].isna(), chunk[col].astype(t))
+            yield chunk
+    else:  # Anything else is treated as CSV
+        yield from pd.read_csv(input_path, chunksize=chunksize, dtype=dtype)
+
+
+def score_chunk(model, chunk, features=None):
+    # Score one chunk with a single predict_proba call; the decision is derived from the
+    # probabilities instead of running the pipeline a second time through predict()
+    X = chunk[features] if features is not None else chunk  # Keep only the model's input columns
+    proba = model.predict_proba(X)  # One vectorized pass through the whole pipeline
+    out = pd.DataFrame(index=chunk.index)  # Result frame aligned with the input rows
+    out["prediction"] = model.classes_[np.argmax(proba, axis=1)]  # Same decision rule as predict()
+    for i, cls in enumerate(model.classes_):  # One probability column per class
+        out[f"proba_{cls}"] = proba[:, i]
+    return out
+
+
+class _ParquetSink:
+    # Appends chunks to a single Parquet file, keeping the schema of the first chunk
+    def __init__(self, path):
+        self.path = path
+        self.writer = None  # Created lazily once the first chunk's schema is known
+
+    def write(self, df):
+        import pyarrow as pa  # Optional dependency, only needed for Parquet output
+        import pyarrow.parquet as pq
+        if self.writer is None:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            self.writer = pq.ParquetWriter(self.path, table.schema)
+        else:  # Later chunks are cast to the first chunk's schema
+            table = pa.Table.from_pandas(df, schema=self.writer.schema, preserve_index=False)
+        self.writer.write_table(table)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+class _CsvSink:
+    # Appends chunks to a CSV file, writing the header only once
+    def __init__(self, path):
+        self.path = path
+        self.header = True
+
+    def write(self, df):
+        df.to_csv(self.path, mode="w" if self.header else "a", header=self.header, index=False)
+        self.header = False
+
+    def close(self):
+        pass
+
+
+def score_file(
+    input_path,  # CSV or Parquet file of applications (same schema as test.csv)
+    output_path,  # Where to write the scored rows (.csv or .parquet)
+    model_path="my_model_1.pkl",  # Registered model name or path of a saved pipeline
+    chunksize=100_000,  # Rows per chunk; bounds memory use regardless of input size
+    keep_columns=None,  # Input columns to copy into the output (default: all of them)
+    model=None,  # Already loaded model, skips loading from model_path
+    verbose=False,  # Print running throughput after each chunk
+):
+    if model is None:
+        model = load_model(model_path)  # Load the pipeline once for the whole run
+    features = list(model.feature_names_in_) if hasattr(model, "feature_names_in_") else None
+    dtype = {c: str for c in categorical_columns(model)}  # Keep encoded columns as strings
+    dtype.update({c: "float64" for c in numeric_columns(model)})  # Same numeric type in every chunk
+
+    sink = _ParquetSink(output_path) if output_path.endswith(".parquet") else _CsvSink(output_path)
+    rows = 0  # Total rows scored so far
+    start = time.perf_counter()
+    try:
+        for chunk in iter_chunks(input_path, chunksize, dtype=dtype or None):
+            scored = score_chunk(model, chunk, features)  # Predictions and probabilities
+            kept = chunk if keep_columns is None else chunk[keep_columns]
+            sink.write(pd.concat([kept, scored], axis=1))  # Write the chunk and drop it
+            rows += len(chunk)
+            if verbose:
+                elapsed = time.perf_counter() - start
+                print(f"{rows} rows scored, {rows / elapsed:,.0f} rows/sec")
+    finally:
+        sink.close()  # Always finalize the output file (Parquet needs a footer)
+
+    seconds = time.perf_counter() - start
+    return {
+        "rows": rows,  # Number of applications scored
+        "seconds": seconds,  # Wall-clock scoring time
+        "rows_per_sec": rows / seconds if seconds > 0 else None,  # Throughput
+        "output_path": output_path,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Batch-score a file of loan applications.")
+    parser.add_argument("input", help="CSV or Parquet file with the same columns as test.csv")
+    parser.add_argument("output", help="Output file (.csv or .parquet)")
+    parser.add_argument("--model", default="my_model_1.pkl", help="Registered model name or path of a saved pipeline")
+    parser.add_argument("--chunksize", type=int, default=100_000, help="Rows per chunk")
+    parser.add_argument("--keep", nargs="*", default=None, help="Input columns to keep in the output")
+    parser.add_argument("--quiet", action="store_true", help="Only print the final summary")
+    args = parser.parse_args(argv)
+
+    stats = score_file(
+        args.input,
+        args.output,
+        model_path=args.model,
+        chunksize=args.chunksize,
+        keep_columns=args.keep,
+        verbose=not args.quiet,
+    )
+    print(f"Scored {stats['rows']} rows in {stats['seconds']:.2f}s ({stats['rows_per_sec']:,.0f} rows/sec) -> {stats['output_path']}")
+
+
+if __name__ == "__main__":
+    main()
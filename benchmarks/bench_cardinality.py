@@ -0,0 +1,55 @@
+import argparse  # For the command-line interface
+import os  # For file sizes
+import tempfile  # For the synthetic CSVs and saved models
+import time  # For fit timing
+from auto_ml import auto_train_model  # Training entry point being measured
+from benchmarks.synthetic import make_loan_frame  # train.csv-shaped synthetic data
+
+
+def run(sizes, max_unprofiled_rows):
+    # Fit time and pickle size with and without column profiling, per dataset size
+    results = []
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)  # Keep the benchmark models out of the project's model registry
+        try:
+            for n_rows in sizes:
+                data_path = os.path.join(tmp, f"loans_{n_rows}.csv")
+                make_loan_frame(n_rows).to_csv(data_path, index=False)
+                for profile in (True, False):
+                    if not profile and n_rows > max_unprofiled_rows:
+                        # One one-hot column per Loan_ID makes these runs impractically slow
+                        results.append({"rows": n_rows, "profile": profile, "fit_seconds": None, "pickle_bytes": None})
+                        continue
+                    model_name = f"model_{n_rows}_{profile}"
+                    start = time.perf_counter()
+                    _, metrics = auto_train_model(
+                        full_path=data_path, target_column="Loan_Status", model_name=model_name, profile=profile
+                    )
+                    results.append({
+                        "rows": n_rows,
+                        "profile": profile,
+                        "fit_seconds": time.perf_counter() - start,  # Load, fit, evaluate and save
+                        "pickle_bytes": os.path.getsize(metrics["model_path"]),
+                        "dropped": (metrics.get("column_profile") or {}).get("dropped"),
+                    })
+        finally:
+            os.chdir(cwd)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark column profiling on synthetic loan data.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000], help="Rows per run")
+    parser.add_argument("--max-unprofiled-rows", type=int, default=100_000, help="Skip unprofiled runs above this size")
+    args = parser.parse_args(argv)
+
+    print(f"{'rows':>10} {'profile':>8} {'fit_s':>8} {'pickle_kb':>10}  dropped")
+    for r in run(args.sizes, args.max_unprofiled_rows):
+        fit = f"{r['fit_seconds']:.2f}" if r["fit_seconds"] is not None else "skipped"
+        size = f"{r['pickle_bytes'] / 1024:.1f}" if r["pickle_bytes"] is not None else "-"
+        print(f"{r['rows']:>10} {str(r['profile']):>8} {fit:>8} {size:>10}  {r.get('dropped') or ''}")
+
+
+if __name__ == "__main__":
+    main()
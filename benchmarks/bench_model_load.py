@@ -0,0 +1,95 @@
+import argparse  # For the command-line interface
+import multiprocessing as mp  # For simulating several worker processes
+import os  # For temporary paths
+import tempfile  # For the synthetic training data and registry
+import time  # For load timing
+from benchmarks.synthetic import make_loan_frame  # train.csv-shaped synthetic data
+
+
+def _memory_kb():
+    # Resident and proportional set size of this process in kB (PSS splits shared pages
+    # between the processes that map them); Linux only, None elsewhere
+    rss = pss = None
+    try:
+        with open("/proc/self/smaps_rollup") as f:
+            for line in f:
+                if line.startswith("Rss:"):
+                    rss = int(line.split()[1])
+                elif line.startswith("Pss:"):
+                    pss = int(line.split()[1])
+    except OSError:
+        pass
+    return rss, pss
+
+
+def _worker(path, mmap_mode, sample, barrier, results):
+    import gc
+    import joblib
+    # Throwaway load and predict first, so lazy imports and first-call allocations are not counted
+    joblib.load(path, mmap_mode=mmap_mode).predict_proba(sample)
+    gc.collect()
+    before_rss, before_pss = _memory_kb()
+    start = time.perf_counter()
+    model = joblib.load(path, mmap_mode=mmap_mode)
+    load_seconds = time.perf_counter() - start
+    model.predict_proba(sample)  # Touch the model once, like a warm-up request
+    barrier.wait()  # Measure while every worker holds its model
+    rss, pss = _memory_kb()
+    results.put({
+        "load_seconds": load_seconds,
+        "rss_kb": None if rss is None else rss - before_rss,  # Memory added by the model
+        "pss_kb": None if pss is None else pss - before_pss,
+    })
+    barrier.wait()  # Keep the mappings alive until everyone has measured
+
+
+def measure(path, mmap_mode, sample, workers):
+    # Start `workers` fresh processes that each load the model; return their measurements
+    ctx = mp.get_context("spawn")  # Fresh interpreters, like separate server workers
+    barrier = ctx.Barrier(workers)
+    results = ctx.Queue()
+    procs = [ctx.Process(target=_worker, args=(path, mmap_mode, sample, barrier, results)) for _ in range(workers)]
+    for p in procs:
+        p.start()
+    out = [results.get() for _ in procs]
+    for p in procs:
+        p.join()
+    return out
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare pickle vs memory-mapped model loading across workers.")
+    parser.add_argument("--rows", type=int, default=100_000, help="Synthetic training rows")
+    parser.add_argument("--workers", type=int, default=4, help="Worker processes loading the model")
+    parser.add_argument("--no-profile", action="store_true", help="Keep Loan_ID to get a much wider model")
+    args = parser.parse_args(argv)
+
+    from auto_ml import auto_train_model
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)  # Keep the benchmark model out of the project's model registry
+        try:
+            df = make_loan_frame(args.rows)
+            df.to_csv("loans.csv", index=False)
+            _, metrics = auto_train_model(
+                full_path="loans.csv", target_column="Loan_Status", model_name="bench",
+                profile=not args.no_profile, mmap=True,
+            )
+            path = metrics["model_path"]
+            sample = df.drop(columns=["Loan_Status"]).head(1)
+            print(f"Model artifact: {os.path.getsize(path) / 1024:.1f} kB, {args.workers} workers")
+            print(f"{'mode':>8} {'load_ms':>9} {'rss_kb':>9} {'pss_kb':>9}   (mean per worker)")
+            for mode, mmap_mode in (("pickle", None), ("mmap", "r")):
+                runs = measure(path, mmap_mode, sample, args.workers)
+                load_ms = sum(r["load_seconds"] for r in runs) / len(runs) * 1000
+                rss = [r["rss_kb"] for r in runs if r["rss_kb"] is not None]
+                pss = [r["pss_kb"] for r in runs if r["pss_kb"] is not None]
+                rss_text = f"{sum(rss) / len(rss):.0f}" if rss else "n/a"
+                pss_text = f"{sum(pss) / len(pss):.0f}" if pss else "n/a"
+                print(f"{mode:>8} {load_ms:>9.1f} {rss_text:>9} {pss_text:>9}")
+        finally:
+            os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    main()
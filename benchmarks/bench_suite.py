@@ -0,0 +1,228 @@
+import argparse  # For the command-line interface
+import json  # For machine-readable results and baselines
+import multiprocessing as mp  # For measuring training in a fresh process
+import os  # For temporary paths and file sizes
+import platform  # For recording where the results were produced
+import sys  # For the exit status when regressions are found
+import tempfile  # For the synthetic data, model registry and prediction logs
+import time  # For timings
+import numpy as np  # For latency percentiles
+import pandas as pd  # For assembling the synthetic prediction log
+from benchmarks.synthetic import make_loan_frame, write_loan_csv, encode_log_frame  # train.csv-shaped synthetic data
+
+# Measured metrics and which direction is better; everything else in the results is context
+METRICS = {
+    "fit_seconds": "lower",  # Wall-clock time of auto_train_model
+    "peak_memory_mb": "lower",  # Peak resident memory added while training
+    "pickle_kb": "lower",  # Size of the saved model artifact
+    "single_row_p50_ms": "lower",  # predict_proba latency for one application
+    "single_row_p99_ms": "lower",
+    "batch_rows_per_sec": "higher",  # predict_proba throughput on a batch
+    "log_append_rows_per_sec": "higher",  # PredictionLog.append throughput, one row per call
+    "dashboard_count_seconds": "lower",  # count_categories over the whole dataset (uploaded CSV view)
+    "dashboard_log_seconds": "lower",  # read_aggregates on the prediction log (log view)
+}
+
+
+def parse_size(text):
+    # "10k" -> 10000, "1m" -> 1000000, "2500" -> 2500
+    text = text.lower()
+    factor = {"k": 1_000, "m": 1_000_000}.get(text[-1])
+    return int(float(text[:-1]) * factor) if factor else int(text)
+
+
+def _proc_status_kb(field):
+    # A memory field (VmRSS, VmHWM) of /proc/self/status in kB; None where unavailable
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def _reset_peak_rss():
+    # Reset the VmHWM high-water mark to the current RSS (Linux 4.0+)
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def _fit_worker(path, streaming, chunksize, results):
+    # Train in a fresh interpreter so the peak memory belongs to this fit alone
+    from auto_ml import auto_train_model
+    _reset_peak_rss()
+    before = _proc_status_kb("VmRSS")
+    start = time.perf_counter()
+    _, metrics = auto_train_model(
+        full_path=path, target_column="Loan_Status", model_name="bench",
+        streaming=streaming, chunksize=chunksize,
+    )
+    seconds = time.perf_counter() - start
+    peak = _proc_status_kb("VmHWM")
+    results.put({
+        "fit_seconds": seconds,
+        "peak_memory_mb": None if peak is None or before is None else (peak - before) / 1024,
+        "model_path": metrics["model_path"],
+        "accuracy": metrics["accuracy"],
+    })
+
+
+def measure_fit(path, streaming, chunksize):
+    ctx = mp.get_context("spawn")
+    results = ctx.Queue()
+    proc = ctx.Process(target=_fit_worker, args=(path, streaming, chunksize, results))
+    proc.start()
+    try:
+        out = results.get()
+    finally:
+        proc.join()
+    return out
+
+
+def _latency_ms(fn, repeats):
+    # p50 and p99 latency of fn() in milliseconds, after a warm-up call
+    fn()
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return float(np.percentile(times, 50)), float(np.percentile(times, 99))
+
+
+def _timed(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def _log_frame(n_rows, chunksize=1_000_000):
+    # Numeric-coded prediction log rows, generated chunk by chunk
+    return pd.concat(
+        [encode_log_frame(make_loan_frame(min(chunksize, n_rows - start), seed=7 + start))
+         for start in range(0, n_rows, chunksize)],
+        ignore_index=True,
+    )
+
+
+def bench_size(n_rows, workdir, args):
+    import joblib
+    from prediction_log import PredictionLog, count_categories, read_aggregates
+
+    result = {"rows": n_rows}
+    data_path = os.path.join(workdir, f"loans_{n_rows}.csv")
+    write_loan_csv(data_path, n_rows)
+
+    # Training: in memory up to --max-in-memory-rows, streaming above
+    streaming = n_rows > args.max_in_memory_rows
+    result["training_mode"] = "streaming" if streaming else "standard"
+    fit = measure_fit(data_path, streaming, args.chunksize)
+    result.update({k: fit[k] for k in ("fit_seconds", "peak_memory_mb", "accuracy")})
+    result["pickle_kb"] = os.path.getsize(fit["model_path"]) / 1024
+
+    # Scoring: single row (like one form submission) and one vectorized batch
+    model = joblib.load(fit["model_path"])
+    sample = make_loan_frame(args.batch_rows, seed=1, with_target=False)
+    row = sample.iloc[:1]
+    result["single_row_p50_ms"], result["single_row_p99_ms"] = _latency_ms(
+        lambda: model.predict_proba(row), args.repeats
+    )
+    batch_seconds = min(_timed(model.predict_proba, sample) for _ in range(3))
+    result["batch_rows_per_sec"] = len(sample) / batch_seconds
+
+    # Prediction log: one append per prediction, as the app does
+    log_rows = _log_frame(min(n_rows, args.log_rows)).to_dict(orient="records")
+    log_path = os.path.join(workdir, f"log_{n_rows}.db")
+    log = PredictionLog(log_path, flush_interval=0)
+    start = time.perf_counter()
+    for record in log_rows:
+        log.append(record)
+    log.close()  # Includes the final flush
+    result["log_append_rows_per_sec"] = len(log_rows) / (time.perf_counter() - start)
+
+    # Dashboard: counters from a full-size uploaded frame, and from the prediction log
+    frame = _log_frame(n_rows)
+    result["dashboard_count_seconds"] = min(_timed(count_categories, frame) for _ in range(3))
+    del frame
+    result["dashboard_log_seconds"] = min(_timed(read_aggregates, log_path) for _ in range(3))
+    os.remove(data_path)
+    return result
+
+
+def compare(results, baseline, tolerance):
+    # Metrics that got worse than the baseline by more than `tolerance` (a fraction)
+    regressions = []
+    for size, current in results["results"].items():
+        base = baseline.get("results", {}).get(size)
+        if base is None:
+            continue
+        for metric, better in METRICS.items():
+            new, old = current.get(metric), base.get(metric)
+            if new is None or old is None or old == 0:
+                continue
+            change = (new - old) / old
+            worse = change > tolerance if better == "lower" else change < -tolerance
+            if worse:
+                regressions.append({"size": size, "metric": metric, "baseline": old, "current": new, "change": change})
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark training, scoring, logging and dashboard aggregation.")
+    parser.add_argument("--sizes", nargs="+", default=["10k", "1m", "10m"], help="Synthetic dataset sizes (e.g. 10k 1m 10m)")
+    parser.add_argument("--output", default="benchmark_results.json", help="Where to write the results")
+    parser.add_argument("--baseline", help="Earlier results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative slowdown before flagging")
+    parser.add_argument("--max-in-memory-rows", type=int, default=1_000_000, help="Train larger datasets in streaming mode")
+    parser.add_argument("--chunksize", type=int, default=100_000, help="Rows per chunk in streaming mode")
+    parser.add_argument("--batch-rows", type=int, default=10_000, help="Rows per batch prediction")
+    parser.add_argument("--log-rows", type=int, default=20_000, help="Rows appended to the prediction log")
+    parser.add_argument("--repeats", type=int, default=200, help="Single-row predictions timed")
+    args = parser.parse_args(argv)
+    output = os.path.abspath(args.output)
+
+    results = {
+        "meta": {
+            "created_at": time.time(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "results": {},
+    }
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)  # Keep benchmark models out of the project's model registry
+        try:
+            for size in args.sizes:
+                n_rows = parse_size(size)
+                print(f"Benchmarking {n_rows:,} rows...", flush=True)
+                results["results"][size] = bench_size(n_rows, tmp, args)
+        finally:
+            os.chdir(cwd)
+
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+
+    print(f"{'size':>6} " + " ".join(f"{m:>24}" for m in METRICS))
+    for size, r in results["results"].items():
+        print(f"{size:>6} " + " ".join(f"{r[m]:>24.4g}" if r.get(m) is not None else f"{'n/a':>24}" for m in METRICS))
+    print(f"Results written to {output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for r in regressions:
+            print(f"REGRESSION {r['size']} {r['metric']}: {r['baseline']:.4g} -> {r['current']:.4g} ({r['change']:+.0%})")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.tolerance:.0%} against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import numpy as np  # For random sampling
+import pandas as pd  # For building the synthetic frame
+from loan_schema import CATEGORIES, coerce_loans, to_codes  # Numeric codes of the prediction log
+
+
+def _choice(rng, n, values, probs, missing=0.0):
+    # Sample categorical values with a share of missing entries
+    out = rng.choice(np.array(values, dtype=object), size=n, p=probs)
+    if missing:
+        out[rng.random(n) < missing] = None
+    return out
+
+
+def make_loan_frame(n_rows, seed=42, with_target=True, id_offset=0):
+    # Synthetic applications with the train.csv schema and roughly its distributions
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "Loan_ID": [f"LP{i:08d}" for i in range(id_offset, id_offset + n_rows)],  # Unique per row, like the real data
+        "Gender": _choice(rng, n_rows, ["Male", "Female"], [0.81, 0.19], missing=0.02),
+        "Married": _choice(rng, n_rows, ["Yes", "No"], [0.65, 0.35], missing=0.005),
+        "Dependents": _choice(rng, n_rows, ["0", "1", "2", "3+"], [0.58, 0.17, 0.17, 0.08], missing=0.025),
+        "Education": _choice(rng, n_rows, ["Graduate", "Not Graduate"], [0.78, 0.22]),
+        "Self_Employed": _choice(rng, n_rows, ["No", "Yes"], [0.86, 0.14], missing=0.05),
+        "ApplicantIncome": np.round(rng.lognormal(8.3, 0.6, n_rows)).astype(int),
+        "CoapplicantIncome": np.where(rng.random(n_rows) < 0.45, 0.0, np.round(rng.lognormal(7.4, 0.6, n_rows))),
+        "LoanAmount": np.round(rng.lognormal(4.9, 0.45, n_rows)),
+        "Loan_Amount_Term": rng.choice([360.0, 180.0, 480.0, 300.0, 240.0, 84.0], size=n_rows, p=[0.87, 0.07, 0.025, 0.02, 0.008, 0.007]),
+        "Credit_History": rng.choice([1.0, 0.0], size=n_rows, p=[0.84, 0.16]),
+        "Property_Area": _choice(rng, n_rows, ["Semiurban", "Urban", "Rural"], [0.38, 0.33, 0.29]),
+    })
+    for col, share in [("LoanAmount", 0.036), ("Loan_Amount_Term", 0.023), ("Credit_History", 0.08)]:
+        df.loc[rng.random(n_rows) < share, col] = np.nan  # Missing numeric values
+    if with_target:
+        # Approval mostly driven by credit history, as in the real data
+        p = np.where(df["Credit_History"] == 0.0, 0.08, 0.79)
+        p = p + np.where(df["Property_Area"] == "Semiurban", 0.05, 0.0)
+        df["Loan_Status"] = np.where(rng.random(n_rows) < np.clip(p, 0, 1), "Y", "N")
+    return df
+
+
+def write_loan_csv(path, n_rows, seed=42, chunksize=1_000_000):
+    # Write a synthetic train.csv-shaped file chunk by chunk, so 10M+ rows fit in memory
+    for start in range(0, n_rows, chunksize):
+        chunk = make_loan_frame(min(chunksize, n_rows - start), seed=seed + start, id_offset=start)
+        chunk.to_csv(path, mode="w" if start == 0 else "a", header=start == 0, index=False)
+
+
+def encode_log_frame(df):
+    # Synthetic applications in the numeric-coded form of the prediction log (loan_schema's codes)
+    out = df.drop(columns=["Loan_ID"])
+    coded = to_codes(coerce_loans(out[list(CATEGORIES)], strict=True))
+    for col in CATEGORIES:
+        out[col] = coded[col].fillna(0).astype(int)  # Missing answers become the first option
+    return out
@@ -0,0 +1,128 @@
+import hashlib  # For cache keys
+import importlib.util  # For detecting the optional pyarrow dependency
+import os  # For cache files, sizes and atomic renames
+import tempfile  # For writing entries before they become visible
+import threading  # For guarding eviction
+import joblib  # For storing fitted preprocessing output
+import pandas as pd  # For parsed training frames
+from model_registry import file_fingerprint  # Content hash of uploaded files
+
+DEFAULT_CACHE_DIR = os.path.join(".cache", "training")  # Default cache location
+DEFAULT_CACHE_BYTES = 2 << 30  # Default size cap (2 GiB)
+
+# Parsed frames are stored as Parquet when pyarrow is installed, otherwise as pickles
+_FRAME_FORMAT = "parquet" if importlib.util.find_spec("pyarrow") else "pkl"
+
+
+def cache_key(*parts):
+    # Stable key for any combination of fingerprints, column names and settings
+    return hashlib.sha256(repr(parts).encode()).hexdigest()
+
+
+class TrainingCache:
+    # On-disk cache for training runs: parsed, typed frames keyed by the content hash of the
+    # CSV, and fitted preprocessing output keyed by the data, target column and settings.
+    # Least recently used entries are evicted once the cache grows beyond max_bytes.
+    def __init__(self, root=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_CACHE_BYTES):
+        self.root = os.path.abspath(root)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(self.root, exist_ok=True)
+
+    def __getstate__(self):
+        # Picklable (e.g. for training in another process); the lock is per process
+        return {"root": self.root, "max_bytes": self.max_bytes}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def _path(self, key, ext):
+        return os.path.join(self.root, f"{key}.{ext}")
+
+    def _hit(self, path):
+        if not os.path.exists(path):
+            return False
+        try:
+            os.utime(path)  # Mark as recently used for eviction
+        except OSError:
+            return False  # Evicted meanwhile
+        return True
+
+    def _write(self, path, writer):
+        # Write through a temporary file so readers never see partial entries
+        fd, tmp = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        os.close(fd)
+        try:
+            writer(tmp)
+            os.replace(tmp, path)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        self.evict()
+
+    def read_csv(self, path, fingerprint=None, reader=pd.read_csv):
+        # Parsed frame for a CSV file; parses it with `reader` and stores it on the first call only
+        fingerprint = fingerprint or file_fingerprint(path)
+        key = cache_key("frame", fingerprint, reader.__module__, reader.__qualname__)  # Typed differently per reader
+        cached = self._path(f"frame-{key}", _FRAME_FORMAT)
+        if self._hit(cached):
+            return pd.read_parquet(cached) if _FRAME_FORMAT == "parquet" else pd.read_pickle(cached)
+        df = reader(path)
+        if _FRAME_FORMAT == "parquet":
+            self._write(cached, lambda tmp: df.to_parquet(tmp, index=False))
+        else:
+            self._write(cached, lambda tmp: df.to_pickle(tmp))
+        return df
+
+    def get(self, key):
+        # Cached object for `key`, or None
+        path = self._path(key, "joblib")
+        if not self._hit(path):
+            return None
+        try:
+            return joblib.load(path)
+        except (OSError, EOFError):
+            return None
+
+    def put(self, key, value):
+        self._write(self._path(key, "joblib"), lambda tmp: joblib.dump(value, tmp))
+
+    def size(self):
+        # Total bytes used by cache entries
+        return sum(entry.stat().st_size for entry in os.scandir(self.root) if entry.is_file())
+
+    def evict(self):
+        # Remove least recently used entries until the cache fits in max_bytes
+        with self._lock:
+            entries = []
+            for entry in os.scandir(self.root):
+                if entry.is_file() and not entry.name.endswith(".tmp"):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+
+    def clear(self):
+        for entry in os.scandir(self.root):
+            if entry.is_file():
+                os.remove(entry.path)
+
+
+_caches = {}  # One cache object per root and process
+_caches_lock = threading.Lock()
+
+
+def get_training_cache(root=DEFAULT_CACHE_DIR, **kwargs):
+    # Process-wide TrainingCache for `root`
+    root = os.path.abspath(root)
+    with _caches_lock:
+        if root not in _caches:
+            _caches[root] = TrainingCache(root, **kwargs)
+        return _caches[root]
@@ -0,0 +1,326 @@
+import argparse  # For the command-line export/check interface
+import math  # For NaN checks on single values
+import pickle  # For saving/loading the compact predictor (no sklearn objects inside)
+import time  # For the latency comparison
+import warnings  # For silencing unknown-category warnings while probing the encoder
+import numpy as np  # All scoring maths is plain NumPy
+import pandas as pd  # For vectorized category lookups on DataFrames
+from loan_schema import to_labels, value_labels  # The pipeline's schema step (numeric codes -> labels)
+
+
+class FastPredictor:
+    # NumPy-only version of a fitted imputer -> scaler/one-hot -> linear classifier pipeline.
+    # Imputation values, scaler statistics and the classifier coefficients are folded into
+    # one weight matrix for numeric columns and one lookup table per categorical column,
+    # so scoring is a dot product plus a few table lookups.
+    def __init__(self, num_features, num_fill, num_weights, cat_features, cat_categories,
+                 cat_tables, cat_fill, intercept, classes, link, label_columns=()):
+        self.num_features = list(num_features)  # Numeric input columns, in weight-matrix order
+        self.num_fill = np.asarray(num_fill, dtype=float)  # Imputation value per numeric column
+        self.num_weights = np.asarray(num_weights, dtype=float)  # (n_num, n_outputs), scaling folded in
+        self.cat_features = list(cat_features)  # Categorical input columns
+        self.cat_categories = [list(c) for c in cat_categories]  # Known categories per column
+        self.cat_tables = [np.asarray(t, dtype=float) for t in cat_tables]  # (n_cats + 1, n_outputs); last row = unknown
+        self.cat_fill = [np.asarray(f, dtype=float) for f in cat_fill]  # Contribution of a missing value
+        self.intercept = np.asarray(intercept, dtype=float)  # (n_outputs,), scaler means folded in
+        self.classes_ = np.asarray(classes)  # Class labels, same order as the original model
+        self.link = link  # "logistic" (binary), "softmax" (multinomial) or "ovr"
+        self.label_columns = list(label_columns)  # Loan columns that also accept numeric codes, as the pipeline's schema step
+        self.feature_names_in_ = np.asarray(self.num_features + self.cat_features, dtype=object)
+        self._build_lookups()
+
+    def _build_lookups(self):
+        # Index objects for the batch path and dicts for the single-row path
+        self._cat_index = [pd.Index(cats) for cats in self.cat_categories]
+        self._cat_maps = [
+            {cat: table[i] for i, cat in enumerate(cats)}
+            for cats, table in zip(self.cat_categories, self.cat_tables)
+        ]
+        for col, mapping in zip(self.cat_features, self._cat_maps):  # Codes and aliases look up their label's row
+            if col in self.label_columns:
+                for spelling, label in value_labels(col).items():
+                    if label in mapping:
+                        mapping.setdefault(spelling, mapping[label])
+
+    @np.errstate(over="ignore")  # exp overflow saturates to probability 0/1, as in sklearn
+    def _probabilities(self, z):
+        # Turn decision values (n_rows, n_outputs) into class probabilities
+        if self.link == "logistic":  # Binary: one decision value for the positive class
+            p = 1.0 / (1.0 + np.exp(-z[:, 0]))
+            return np.column_stack([1.0 - p, p])
+        if self.link == "softmax":  # Multinomial logistic regression
+            z = z - z.max(axis=1, keepdims=True)
+            e = np.exp(z)
+            return e / e.sum(axis=1, keepdims=True)
+        p = 1.0 / (1.0 + np.exp(-z))  # One-vs-rest: normalize independent sigmoids
+        return p / p.sum(axis=1, keepdims=True)
+
+    def decision_rows(self, X):
+        # Decision values for a DataFrame of applications
+        if self.label_columns:
+            X = to_labels(X, self.label_columns)
+        num = X[self.num_features].to_numpy(dtype=float) if self.num_features else np.zeros((len(X), 0))
+        num = np.where(np.isnan(num), self.num_fill, num)  # Mean/median imputation
+        z = num @ self.num_weights + self.intercept  # Scaling and coefficients in one product
+        for col, index, table, fill in zip(self.cat_features, self._cat_index, self.cat_tables, self.cat_fill):
+            values = X[col]
+            codes = index.get_indexer(values)  # -1 for unknown and missing
+            contrib = table[codes]  # Index -1 picks the last (unknown) row
+            missing = values.isna().to_numpy()
+            if missing.any():
+                contrib[missing] = fill  # Missing values take the imputed category's weights
+            z += contrib
+        return z
+
+    def decision_one(self, record):
+        # Decision values for one application given as a dict (pure Python lookups, no DataFrame)
+        x = np.array([_to_float(record.get(f)) for f in self.num_features], dtype=float)
+        x = np.where(np.isnan(x), self.num_fill, x)
+        z = self.intercept + x @ self.num_weights
+        for col, mapping, table, fill in zip(self.cat_features, self._cat_maps, self.cat_tables, self.cat_fill):
+            value = record.get(col)
+            if _is_missing(value):
+                z = z + fill
+            else:
+                z = z + mapping.get(value, table[-1])
+        return z[np.newaxis, :]
+
+    def predict_proba(self, X):
+        # Same output as pipeline.predict_proba for a DataFrame, a dict or a list of dicts
+        if isinstance(X, dict):
+            return self._probabilities(self.decision_one(X))
+        if not isinstance(X, pd.DataFrame):
+            X = pd.DataFrame(list(X))
+        return self._probabilities(self.decision_rows(X))
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_cat_index"], state["_cat_maps"]  # Rebuilt on load
+        return state
+
+    def __setstate__(self, state):
+        state.setdefault("label_columns", [])  # Saved before pipelines had a schema step
+        self.__dict__.update(state)
+        self._build_lookups()
+
+
+def _is_missing(value):
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+def _to_float(value):
+    return math.nan if _is_missing(value) else float(value)
+
+
+def load_fast_predictor(path):
+    # Load a predictor saved with FastPredictor.save (only needs NumPy and pandas)
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+def _linear_head(clf):
+    # Coefficients, intercept and link function of a supported linear classifier
+    from sklearn.linear_model import LogisticRegression, SGDClassifier
+    if isinstance(clf, LogisticRegression):
+        if len(clf.classes_) == 2:
+            link = "logistic"
+        else:
+            link = "ovr" if clf.solver == "liblinear" else "softmax"
+    elif isinstance(clf, SGDClassifier) and clf.loss == "log_loss":
+        link = "logistic" if len(clf.classes_) == 2 else "ovr"
+    else:
+        raise ValueError(f"Cannot compile classifier {type(clf).__name__}; only logistic models are supported")
+    return clf.coef_.T.astype(float), clf.intercept_.astype(float), link  # coef as (n_features, n_outputs)
+
+
+def _compile_numeric(steps, cols, coef):
+    # Fold imputer and scaler into weights for the numeric block; returns fill, weights, intercept shift
+    from sklearn.impute import SimpleImputer
+    from sklearn.preprocessing import StandardScaler
+    fill = np.full(len(cols), np.nan)  # No imputer: NaN propagates, like sklearn would fail
+    mean = np.zeros(len(cols))
+    scale = np.ones(len(cols))
+    for step in steps:
+        if isinstance(step, SimpleImputer):
+            if len(step.statistics_) != len(cols) or step.add_indicator:
+                raise ValueError("Numeric imputers that drop columns or add indicators are not supported")
+            fill = step.statistics_.astype(float)
+        elif isinstance(step, StandardScaler):
+            if step.mean_ is not None:
+                mean = step.mean_
+            if step.scale_ is not None:
+                scale = step.scale_
+        else:
+            raise ValueError(f"Unsupported numeric step {type(step).__name__}")
+    weights = coef / scale[:, np.newaxis]  # w * (x - m) / s == (w / s) * x - w * m / s
+    shift = -(mean / scale) @ coef
+    return fill, weights, shift
+
+
+def _compile_categorical(steps, cols, coef):
+    # Build per-column lookup tables of classifier contributions for the categorical block
+    from sklearn.impute import SimpleImputer
+    from sklearn.preprocessing import OneHotEncoder
+    imputer, encoder = None, None
+    for step in steps:
+        if isinstance(step, SimpleImputer):
+            imputer = step
+        elif isinstance(step, OneHotEncoder):
+            encoder = step
+        else:
+            raise ValueError(f"Unsupported categorical step {type(step).__name__}")
+    if encoder is None or encoder.drop is not None:
+        raise ValueError("Categorical block must end in a OneHotEncoder without drop")
+
+    n_out = getattr(encoder, "_n_features_outs", [len(c) for c in encoder.categories_])
+    offsets = np.concatenate([[0], np.cumsum(n_out)])
+    base = [cats[0] for cats in encoder.categories_]  # Filler values for the other columns in a probe
+    categories, tables, fills = [], [], []
+    for j, cats in enumerate(encoder.categories_):
+        block = coef[offsets[j]:offsets[j + 1]]  # Coefficients of this column's one-hot outputs
+
+        def contribution(values):
+            probe = np.array([base] * len(values), dtype=object)
+            probe[:, j] = values
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                encoded = encoder.transform(probe)
+            encoded = encoded.toarray() if hasattr(encoded, "toarray") else np.asarray(encoded)
+            return encoded[:, offsets[j]:offsets[j + 1]] @ block
+
+        known = contribution(list(cats))  # Handles infrequent-category buckets too
+        if encoder.handle_unknown == "error":
+            unknown = np.full(coef.shape[1], np.nan)  # Unknown values give NaN instead of raising
+        else:
+            try:
+                unknown = contribution(["\x00unseen"])[0]  # Whatever the encoder does with an unseen value
+            except (TypeError, ValueError):
+                unknown = np.zeros(coef.shape[1])
+        categories.append(list(cats))
+        tables.append(np.vstack([known, unknown]))
+        if imputer is not None:  # Missing values are replaced by the imputer's statistic first
+            fill_value = imputer.statistics_[j]
+            matches = [i for i, c in enumerate(cats) if c == fill_value]
+            fills.append(known[matches[0]] if matches else unknown)
+        else:
+            fills.append(unknown)
+    return categories, tables, fills
+
+
+def compile_pipeline(model):
+    # Export a fitted auto_ml pipeline (or a bare linear classifier) to a FastPredictor
+    from sklearn.compose import ColumnTransformer
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import FunctionTransformer
+    from loan_schema import CATEGORIES
+
+    if not isinstance(model, Pipeline):  # Bare classifier on numeric features (e.g. model.pkl)
+        coef, intercept, link = _linear_head(model)
+        names = list(model.feature_names_in_)
+        return FastPredictor(names, np.full(len(names), np.nan), coef, [], [], [], [],
+                             intercept, model.classes_, link)
+
+    steps = list(model.steps)
+    labels = isinstance(steps[0][1], FunctionTransformer) and steps[0][1].func is to_labels  # Schema step
+    if labels:
+        steps = steps[1:]
+    prep, clf = steps[0][1], steps[-1][1]
+    if len(steps) != 2 or not isinstance(prep, ColumnTransformer):
+        raise ValueError("Expected a Pipeline of an optional schema step, a ColumnTransformer and a classifier")
+    coef, intercept, link = _linear_head(clf)
+    intercept = intercept.copy()
+
+    num_features, num_fill, num_weights = [], [], []
+    cat_features, cat_categories, cat_tables, cat_fill = [], [], [], []
+    for name, trans, cols in prep.transformers_:
+        if trans == "drop" or len(cols) == 0:
+            continue
+        cols = list(cols)
+        steps = [s for _, s in trans.steps] if isinstance(trans, Pipeline) else [trans]
+        block = coef[prep.output_indices_[name]]
+        if name.startswith("cat"):  # "cat" and the capped high-cardinality block
+            cats, tables, fills = _compile_categorical(steps, cols, block)
+            cat_features += cols
+            cat_categories += cats
+            cat_tables += tables
+            cat_fill += fills
+        else:
+            fill, weights, shift = _compile_numeric(steps, cols, block)
+            num_features += cols
+            num_fill.append(fill)
+            num_weights.append(weights)
+            intercept += shift
+
+    n_outputs = coef.shape[1]
+    return FastPredictor(
+        num_features,
+        np.concatenate(num_fill) if num_fill else np.zeros(0),
+        np.vstack(num_weights) if num_weights else np.zeros((0, n_outputs)),
+        cat_features, cat_categories, cat_tables, cat_fill,
+        intercept, clf.classes_, link,
+        [c for c in cat_features if c in CATEGORIES] if labels else [],
+    )
+
+
+def check_equivalence(model, fast, data_paths, atol=1e-9):
+    # Compare FastPredictor against the original model on the given CSVs; returns max abs difference
+    features = list(model.feature_names_in_)
+    worst = 0.0
+    for path in data_paths:
+        X = pd.read_csv(path)[features]
+        expected = model.predict_proba(X)
+        got = fast.predict_proba(X)
+        diff = float(np.abs(expected - got).max())
+        if diff > atol:
+            raise AssertionError(f"{path}: batch probabilities differ by {diff}")
+        for record, row in zip(X.head(50).to_dict(orient="records"), expected[:50]):  # Single-row path
+            one = fast.predict_proba(record)[0]
+            if np.abs(one - row).max() > atol:
+                raise AssertionError(f"{path}: single-row probabilities differ for {record}")
+        if not (model.predict(X) == fast.predict(X)).all():
+            raise AssertionError(f"{path}: predicted classes differ")
+        worst = max(worst, diff)
+    return worst
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile a saved pipeline into a NumPy-only predictor.")
+    parser.add_argument("--model", default="my_model_1.pkl", help="Registered model name or path of a saved pipeline")
+    parser.add_argument("--output", default=None, help="Where to save the compiled predictor")
+    parser.add_argument("--check", nargs="*", default=["train.csv", "test.csv"], help="CSVs to verify equivalence on")
+    args = parser.parse_args(argv)
+
+    from model_registry import load_model
+    import fast_predictor  # Compile through the module so the saved class isn't pickled as __main__.FastPredictor
+    model = load_model(args.model)
+    fast = fast_predictor.compile_pipeline(model)
+    if args.check:
+        diff = check_equivalence(model, fast, args.check)
+        print(f"Equivalent on {', '.join(args.check)} (max abs difference {diff:.2e})")
+
+        record = pd.read_csv(args.check[0])[list(model.feature_names_in_)].iloc[[0]]
+        one = record.to_dict(orient="records")[0]
+        n = 2000
+        start = time.perf_counter()
+        for _ in range(n):
+            model.predict_proba(record)
+        slow = (time.perf_counter() - start) / n
+        start = time.perf_counter()
+        for _ in range(n):
+            fast.predict_proba(one)
+        quick = (time.perf_counter() - start) / n
+        print(f"Single-row latency: pipeline {slow * 1e6:.0f}us, fast path {quick * 1e6:.0f}us ({slow / quick:.0f}x)")
+    if args.output:
+        fast.save(args.output)
+        print(f"Saved compiled predictor to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
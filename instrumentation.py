@@ -0,0 +1,286 @@
+import atexit  # For writing the metrics file when the process exits
+import bisect  # For finding histogram buckets
+import cProfile  # For the opt-in per-request profiler
+import os  # For environment configuration and atomic file writes
+import sys  # For the unit of ru_maxrss
+import tempfile  # For writing the metrics file before it becomes visible
+import threading  # For the metric locks, the HTTP endpoint and the file writer
+import time  # For timings and profile file names
+from contextlib import contextmanager  # For timer() and profile_request()
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer  # For the local /metrics endpoint
+
+try:
+    import resource  # Peak resident memory (Unix only)
+except ImportError:
+    resource = None
+
+# Latency histogram buckets in seconds, from sub-millisecond predictions to long training runs
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0,
+)
+
+
+def peak_rss_bytes():
+    # High-water mark of this process's resident memory; None where unavailable
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024  # Bytes on macOS, kB elsewhere
+
+
+class MetricsRegistry:
+    # In-process counters, latency histograms and memory high-water marks. Updates are a dict
+    # lookup and a few additions under a lock, so they can stay on in production.
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._counters = {}  # (name, labels) -> value
+        self._histograms = {}  # (name, labels) -> [bucket counts..., sum, count]
+        self._gauges = {}  # (name, labels) -> value
+        self._help = {}  # name -> description
+        self._lock = threading.Lock()
+
+    def describe(self, name, text):
+        self._help[name] = text
+
+    def inc(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        i = bisect.bisect_left(self.buckets, value)  # First bucket with le >= value
+        with self._lock:
+            hist = self._histograms.get(key)
+            if hist is None:
+                hist = self._histograms[key] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+            hist[i] += 1  # Index len(buckets) is the +Inf bucket
+            hist[-2] += value
+            hist[-1] += 1
+
+    def set_max(self, name, value, **labels):
+        # Gauge that only moves up (high-water marks)
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            if value > self._gauges.get(key, float("-inf")):
+                self._gauges[key] = value
+
+    @contextmanager
+    def timer(self, name, **labels):
+        # Observe the duration of the block in histogram `name`, and record the process's
+        # peak memory at the end of the block (labelled with the histogram's name and labels)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+            peak = peak_rss_bytes()
+            if peak is not None:
+                self.set_max("loan_peak_rss_bytes", peak, metric=name, **labels)
+
+    def stages(self, name, **labels):
+        # Lap timer for code that runs in consecutive stages; see StageTimer
+        return StageTimer(self, name, labels)
+
+    def render(self):
+        # All metrics in the Prometheus text exposition format
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {k: list(v) for k, v in self._histograms.items()}
+            gauges = dict(self._gauges)
+        peak = peak_rss_bytes()
+        if peak is not None:
+            gauges[("process_peak_rss_bytes", ())] = peak
+        lines = []
+        for kind, series in (("counter", counters), ("gauge", gauges)):
+            for name in sorted({n for n, _ in series}):
+                lines.extend(self._header(name, kind))
+                for (n, labels), value in sorted(series.items()):
+                    if n == name:
+                        lines.append(f"{name}{_labels(labels)} {_number(value)}")
+        for name in sorted({n for n, _ in histograms}):
+            lines.extend(self._header(name, "histogram"))
+            for (n, labels), hist in sorted(histograms.items()):
+                if n != name:
+                    continue
+                cumulative = 0
+                for le, count in zip(self.buckets + (float("inf"),), hist):
+                    cumulative += count
+                    bound = "+Inf" if le == float("inf") else f"{le:g}"
+                    lines.append(f"{name}_bucket{_labels(labels + (('le', bound),))} {cumulative}")
+                lines.append(f"{name}_sum{_labels(labels)} {_number(hist[-2])}")
+                lines.append(f"{name}_count{_labels(labels)} {hist[-1]}")
+        return "\n".join(lines) + "\n"
+
+    def _header(self, name, kind):
+        lines = [f"# HELP {name} {self._help[name]}"] if name in self._help else []
+        return lines + [f"# TYPE {name} {kind}"]
+
+    def write(self, path):
+        # Write the current metrics to `path` (e.g. for the node_exporter textfile collector)
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".prom.tmp")
+        with os.fdopen(fd, "w") as f:
+            f.write(self.render())
+        os.replace(tmp, path)  # Scrapers never see a partial file
+
+    def snapshot(self):
+        # Copy of every series, e.g. for sending a worker process's metrics to the app (see merge)
+        with self._lock:
+            return {
+                "counters": dict(self._counters),
+                "histograms": {k: list(v) for k, v in self._histograms.items()},
+                "gauges": dict(self._gauges),
+            }
+
+    def merge(self, snapshot):
+        # Add a snapshot taken in another process (with the same buckets): counters and
+        # histograms are summed, gauges (high-water marks) keep the larger value
+        with self._lock:
+            for key, value in snapshot["counters"].items():
+                self._counters[key] = self._counters.get(key, 0) + value
+            for key, hist in snapshot["histograms"].items():
+                mine = self._histograms.get(key)
+                self._histograms[key] = list(hist) if mine is None else [a + b for a, b in zip(mine, hist)]
+            for key, value in snapshot["gauges"].items():
+                if value > self._gauges.get(key, float("-inf")):
+                    self._gauges[key] = value
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+            self._gauges.clear()
+
+
+class StageTimer:
+    # Records the time since the previous lap (or since creation) under a "stage" label:
+    #     stages = REGISTRY.stages("loan_training_stage_seconds")
+    #     ...load...;  stages.lap("load")
+    #     ...fit...;   stages.lap("fit")
+    def __init__(self, registry, name, labels):
+        self.registry = registry
+        self.name = name
+        self.labels = labels
+        self.last = time.perf_counter()
+
+    def lap(self, stage):
+        now = time.perf_counter()
+        self.registry.observe(self.name, now - self.last, stage=stage, **self.labels)
+        peak = peak_rss_bytes()
+        if peak is not None:
+            self.registry.set_max("loan_peak_rss_bytes", peak, metric=self.name, stage=stage, **self.labels)
+        self.last = now
+
+
+def _number(value):
+    # Sample value without losing precision (integers without a decimal point)
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels):
+    # {key="value",...} with Prometheus escaping, or nothing without labels
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels) + "}"
+
+
+REGISTRY = MetricsRegistry()  # Process-wide registry used by the app, the trainer and the dashboard
+REGISTRY.describe("loan_prediction_seconds", "Latency of one prediction in the Streamlit predictor")
+REGISTRY.describe("loan_predictions_total", "Predictions made by the Streamlit predictor")
+REGISTRY.describe("loan_training_stage_seconds", "Duration of auto_train_model stages")
+REGISTRY.describe("loan_training_runs_total", "auto_train_model runs")
+REGISTRY.describe("loan_dashboard_load_seconds", "Duration of dashboard data loads (cache misses)")
+REGISTRY.describe("loan_peak_rss_bytes", "Process peak resident memory at the end of a timed block")
+REGISTRY.describe("process_peak_rss_bytes", "Process peak resident memory")
+
+timer = REGISTRY.timer
+stages = REGISTRY.stages
+inc = REGISTRY.inc
+observe = REGISTRY.observe
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = self.server.registry.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Keep scrapes out of the app's console
+
+
+_exporters = {}  # Started endpoints and file writers, so reruns don't start them twice
+_exporters_lock = threading.Lock()
+
+
+def start_http_exporter(port=9108, host="127.0.0.1", registry=REGISTRY):
+    # Serve GET /metrics from a daemon thread (local only by default)
+    with _exporters_lock:
+        key = ("http", host, port)
+        if key not in _exporters:
+            server = ThreadingHTTPServer((host, port), _MetricsHandler)
+            server.registry = registry
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            _exporters[key] = server
+        return _exporters[key]
+
+
+def start_file_exporter(path, interval=15.0, registry=REGISTRY):
+    # Rewrite `path` every `interval` seconds and once more at exit
+    with _exporters_lock:
+        key = ("file", os.path.abspath(path))
+        if key not in _exporters:
+            stop = threading.Event()
+
+            def run():
+                while not stop.wait(interval):
+                    registry.write(path)
+
+            threading.Thread(target=run, daemon=True).start()
+            atexit.register(registry.write, path)
+            _exporters[key] = stop
+        return _exporters[key]
+
+
+def configure_from_env():
+    # Start the exporters requested through environment variables:
+    #   LOAN_METRICS_PORT=9108           serve http://127.0.0.1:9108/metrics
+    #   LOAN_METRICS_FILE=metrics.prom   write the metrics to a file every 15 seconds
+    port = os.environ.get("LOAN_METRICS_PORT")
+    if port:
+        start_http_exporter(int(port))
+    path = os.environ.get("LOAN_METRICS_FILE")
+    if path:
+        start_file_exporter(path)
+
+
+@contextmanager
+def profile_request(name, enabled=None, directory=None):
+    # Opt-in cProfile hook for a single request: with LOAN_PROFILE=1 (or enabled=True) the
+    # block is profiled and the stats are written to <directory>/<name>-<timestamp>.prof,
+    # viewable with `python -m pstats` or snakeviz. Disabled, it costs one dict lookup.
+    if enabled is None:
+        enabled = os.environ.get("LOAN_PROFILE", "") not in ("", "0")
+    if not enabled:
+        yield None
+        return
+    directory = directory or os.environ.get("LOAN_PROFILE_DIR", "profiles")
+    os.makedirs(directory, exist_ok=True)
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        profiler.dump_stats(os.path.join(directory, f"{name}-{time.time_ns()}-{os.getpid()}.prof"))
@@ -0,0 +1,105 @@
+import argparse  # For the command-line interface
+import asyncio  # For running many concurrent clients
+import json  # For encoding request bodies
+import subprocess  # For starting a server per batch window
+import sys  # For launching the server with the current interpreter
+import time  # For latency and throughput measurement
+import numpy as np  # For latency percentiles
+import pandas as pd  # For reading sample applications
+
+
+def load_payloads(path, limit=1000):
+    # Sample applications to send, taken from a CSV with the test.csv schema
+    df = pd.read_csv(path, nrows=limit)
+    df = df.astype(object).where(df.notna(), None)  # NaN is not valid JSON; send null instead
+    return [json.dumps(row).encode() for row in df.to_dict(orient="records")]
+
+
+async def _client(host, port, payloads, n_requests, latencies):
+    # One keep-alive connection sending requests back to back
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for i in range(n_requests):
+            body = payloads[i % len(payloads)]
+            start = time.perf_counter()
+            writer.write(
+                f"POST /predict HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+            )
+            await writer.drain()
+            await reader.readline()  # Status line
+            length = 0
+            while True:  # Headers
+                line = await reader.readline()
+                if line in (b"\r\n", b""):
+                    break
+                key, _, value = line.decode().partition(":")
+                if key.lower() == "content-length":
+                    length = int(value)
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+    finally:
+        writer.close()
+
+
+async def run_load(host, port, payloads, concurrency=32, requests_per_client=100):
+    # Fire `concurrency` clients at the server and collect per-request latencies
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        _client(host, port, payloads, requests_per_client, latencies) for _ in range(concurrency)
+    ))
+    elapsed = time.perf_counter() - start
+    lat_ms = np.array(latencies) * 1000
+    return {
+        "requests": len(latencies),
+        "throughput_rps": len(latencies) / elapsed,  # Completed requests per second
+        "p50_ms": float(np.percentile(lat_ms, 50)),  # Median latency
+        "p99_ms": float(np.percentile(lat_ms, 99)),  # Tail latency
+    }
+
+
+async def _wait_for_server(host, port, timeout=30.0):
+    # Poll until the server accepts connections
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            _, writer = await asyncio.open_connection(host, port)
+            writer.close()
+            return
+        except OSError:
+            await asyncio.sleep(0.1)
+    raise RuntimeError(f"Server on {host}:{port} did not start within {timeout}s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test prediction_server.py at several batch windows.")
+    parser.add_argument("--data", default="test.csv", help="CSV of sample applications")
+    parser.add_argument("--model", default="my_model_1.pkl", help="Model for the spawned servers")
+    parser.add_argument("--port", type=int, default=8765, help="Port for the spawned servers")
+    parser.add_argument("--windows", type=float, nargs="+", default=[0, 1, 2, 5, 10], help="Batch windows in ms")
+    parser.add_argument("--max-batch-size", type=int, default=64, help="Largest batch per model call")
+    parser.add_argument("--concurrency", type=int, default=32, help="Concurrent client connections")
+    parser.add_argument("--requests", type=int, default=100, help="Requests per client")
+    args = parser.parse_args(argv)
+
+    payloads = load_payloads(args.data)
+    host = "127.0.0.1"
+    print(f"{'window_ms':>10} {'requests':>9} {'rps':>10} {'p50_ms':>9} {'p99_ms':>9}")
+    for window in args.windows:  # One fresh server per batch window
+        server = subprocess.Popen([
+            sys.executable, "prediction_server.py", "--model", args.model, "--host", host,
+            "--port", str(args.port), "--batch-window-ms", str(window),
+            "--max-batch-size", str(args.max_batch_size),
+        ], stdout=subprocess.DEVNULL)
+        try:
+            asyncio.run(_wait_for_server(host, args.port))
+            stats = asyncio.run(run_load(host, args.port, payloads, args.concurrency, args.requests))
+        finally:
+            server.terminate()
+            server.wait()
+        print(f"{window:>10g} {stats['requests']:>9} {stats['throughput_rps']:>10,.0f} {stats['p50_ms']:>9.2f} {stats['p99_ms']:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+import importlib.util  # For detecting the optional pyarrow dependency
+import math  # For checking single numbers
+import pandas as pd  # For typed frames
+
+# Categorical columns and their categories. The position of a category is its numeric code
+# in the predictor form, predicted_data.csv and the prediction log (e.g. Gender 0 = Female),
+# so the string form of train.csv and the numeric-coded form load to the same dtype.
+CATEGORIES = {
+    "Gender": ["Female", "Male"],
+    "Married": ["No", "Yes"],
+    "Dependents": ["0", "1", "2", "3+"],
+    "Education": ["Not Graduate", "Graduate"],
+    "Self_Employed": ["No", "Yes"],
+    "Property_Area": ["Rural", "Semiurban", "Urban"],
+    "Loan_Status": ["N", "Y"],
+}
+ALIASES = {"Dependents": {"3": "3+"}, "Property_Area": {"Semi-Urban": "Semiurban"}}  # Other spellings seen in inputs
+
+# Numeric columns and the smallest dtype that holds them (float, because they can be missing)
+NUMERIC = {
+    "ApplicantIncome": "float32",
+    "CoapplicantIncome": "float32",
+    "LoanAmount": "float32",
+    "Loan_Amount_Term": "float32",
+    "Credit_History": "float32",
+}
+
+DTYPES = {**{c: pd.CategoricalDtype(cats) for c, cats in CATEGORIES.items()}, **NUMERIC}
+
+
+def _lookup(col):
+    # Every accepted spelling of a category (label, code, code as float) -> label
+    table = {}
+    for code, label in enumerate(CATEGORIES[col]):
+        table.update({label: label, str(code): label, f"{code}.0": label, code: label, float(code): label})
+    for alias, label in ALIASES.get(col, {}).items():
+        table[alias] = label
+    return table
+
+
+_LOOKUPS = {col: _lookup(col) for col in CATEGORIES}
+
+
+def _coerce_categorical(s, col, strict):
+    if isinstance(s.dtype, pd.CategoricalDtype) and list(s.cat.categories) == CATEGORIES[col]:
+        return s  # Already in schema form
+    values = s.astype("category")  # Map the distinct values only, not every row
+    table = _LOOKUPS[col]
+    mapping = {v: table.get(v, table.get(str(v).strip())) for v in values.cat.categories}
+    unknown = [v for v, label in mapping.items() if label is None]
+    if unknown:
+        if strict:
+            raise ValueError(f"{col}: unexpected value(s) {unknown[:5]}; expected one of {CATEGORIES[col]} or codes 0-{len(CATEGORIES[col]) - 1}")
+        return s  # Not this schema's column (e.g. another dataset); leave it as it is
+    # set_categories (not astype) so the category order, i.e. the codes, follows the schema
+    return values.map(mapping).astype("category").cat.set_categories(CATEGORIES[col])
+
+
+def _coerce_numeric(s, col, strict):
+    values = pd.to_numeric(s, errors="raise" if strict else "coerce")
+    if not strict and values.isna().sum() > s.isna().sum():
+        return s  # Not numeric in this dataset; leave it as it is
+    return values.astype(NUMERIC[col])
+
+
+def coerce_loans(df, strict=False):
+    # Convert the schema's columns of a frame to their compact dtypes: categories for the
+    # categorical fields (from labels or numeric codes) and float32 for the numeric ones.
+    # Other columns are left alone. With strict=False, columns whose values don't fit the
+    # schema are left unchanged; with strict=True they raise ValueError.
+    out = df.copy(deep=False)
+    for col in out.columns:
+        if col in CATEGORIES:
+            out[col] = _coerce_categorical(out[col], col, strict)
+        elif col in NUMERIC:
+            try:
+                out[col] = _coerce_numeric(out[col], col, strict)
+            except (ValueError, TypeError) as exc:
+                raise ValueError(f"{col}: expected a number ({exc})") from None
+    return out
+
+
+def read_loans(path_or_buffer, engine=None, **kwargs):
+    # read_csv with the loan schema: categorical columns are parsed straight into categories
+    # and numeric ones into float32. The pyarrow engine is used when it is installed; files it
+    # rejects (e.g. ragged rows, which the C parser tolerates) are read with the C engine.
+    if engine is None:
+        engine = "pyarrow" if importlib.util.find_spec("pyarrow") else "c"
+    position = path_or_buffer.tell() if hasattr(path_or_buffer, "tell") else None
+    attempts = [(engine, True), (engine, False)] + ([("c", False)] if engine != "c" else [])
+    for i, (attempt_engine, typed) in enumerate(attempts):
+        if position is not None:
+            path_or_buffer.seek(position)
+        dtype = {**{c: "category" for c in CATEGORIES}, **NUMERIC} if typed else None
+        try:
+            df = pd.read_csv(path_or_buffer, engine=attempt_engine, dtype=dtype, **kwargs)
+        except (ValueError, TypeError):  # Text in a numeric column, or a parse error
+            if i == len(attempts) - 1:
+                raise
+            continue
+        return coerce_loans(df)  # Columns read untyped are converted where they fit the schema
+
+
+def to_codes(df):
+    # Numeric-coded form of a frame in schema form (what model.pkl and the prediction log use)
+    out = df.copy()
+    for col in out.columns:
+        if col in CATEGORIES and isinstance(out[col].dtype, pd.CategoricalDtype):
+            codes = out[col].cat.codes
+            out[col] = codes.where(codes >= 0)  # Missing stays missing
+    return out
+
+
+def to_labels(df, columns=None):
+    # Label form of the schema's categorical columns (all of them, or those in `columns`), for
+    # scoring pipelines that were trained on frames in schema form. Every accepted spelling
+    # (label, code, alias) becomes its label, value by value: unlike coerce_loans, a value
+    # outside the schema doesn't stop the rest of its column from being converted; it is
+    # kept as it is, for the pipeline's encoder to treat as unknown.
+    out = df.copy(deep=False)
+    for col in (out.columns if columns is None else columns):
+        if col not in CATEGORIES or col not in out.columns:
+            continue
+        s = out[col]
+        table = _LOOKUPS[col]
+        mapping = {v: table.get(v, table.get(str(v).strip(), v)) for v in s.dropna().unique()}  # Distinct values only
+        out[col] = s.astype(object).map(mapping)  # Missing values aren't in the mapping and stay missing
+    return out
+
+
+def value_labels(col):
+    # Display label for every accepted spelling of a category, for decoding counts
+    return dict(_LOOKUPS[col])
+
+
+def _is_missing(value):
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+def check_application(application, allow_missing=False):
+    # Check one application (a dict of column -> value) against the schema with plain dict
+    # lookups (microseconds, so a server can check every request); raises ValueError with a
+    # readable message. Columns outside the schema are not checked. With allow_missing=True,
+    # missing values are accepted (for pipelines that impute them).
+    for col, value in application.items():
+        if col in CATEGORIES:
+            if _is_missing(value):
+                if allow_missing or col == "Loan_Status":
+                    continue
+                raise ValueError(f"{col} is required")
+            table = _LOOKUPS[col]
+            try:
+                label = table.get(value, table.get(str(value).strip()))
+            except TypeError:  # Unhashable, e.g. a list
+                label = None
+            if label is None:
+                raise ValueError(f"{col}: unexpected value(s) [{value!r}]; expected one of {CATEGORIES[col]} or codes 0-{len(CATEGORIES[col]) - 1}")
+        elif col in NUMERIC:
+            if _is_missing(value) and allow_missing:
+                continue
+            try:
+                number = float(value)
+            except (TypeError, ValueError):
+                raise ValueError(f"{col}: expected a number (got {value!r})") from None
+            if not math.isfinite(number):
+                raise ValueError(f"{col} must be a finite number")
+            if number < 0:
+                raise ValueError(f"{col} cannot be negative")
+            if col == "Credit_History" and number not in (0.0, 1.0):
+                raise ValueError("Credit_History must be 0 or 1")
+            if col == "Loan_Amount_Term" and number == 0:
+                raise ValueError("Loan_Amount_Term must be positive")
+
+
+def validate_application(application):
+    # Check one application (a dict of column -> value) against the schema and return it as
+    # a one-row frame in schema form; raises ValueError with a readable message otherwise
+    check_application(application)
+    return coerce_loans(pd.DataFrame([application]), strict=True)
@@ -0,0 +1,189 @@
+import hashlib  # For content hashes of model artifacts and training data
+import json  # For the registry index
+import os  # For paths and atomic renames
+import tempfile  # For writing artifacts before they get their content-addressed name
+import threading  # For guarding the index and the cache
+import time  # For creation timestamps
+from collections import OrderedDict  # For the LRU cache of loaded models
+from contextlib import contextmanager  # For the index lock
+import joblib  # For (de)serializing pipelines
+
+try:
+    import fcntl  # File locks shared with other processes (Unix only)
+except ImportError:
+    fcntl = None
+
+DEFAULT_REGISTRY_DIR = "models"  # Default registry location
+DEFAULT_CACHE_BYTES = 1 << 30  # Default memory cap of the loaded-model cache (1 GiB)
+
+
+def file_fingerprint(*paths, block_size=1 << 20):
+    # SHA-256 over the contents of one or more files (e.g. the training data)
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(block_size), b""):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+class ModelRegistry:
+    # Content-addressed model store. Each pipeline is serialized once to
+    # <root>/objects/<sha256>.pkl; <root>/index.json maps model names to their hash and
+    # metadata. Loaded pipelines are kept in an LRU cache bounded by artifact size.
+    # Artifacts are uncompressed joblib pickles, whose NumPy arrays are stored aligned so they
+    # can be memory-mapped: models saved with mmap=True are loaded with mmap_mode="r", and all
+    # processes on a machine then share one page-cache copy of coefficients, scaler arrays etc.
+    def __init__(self, root=DEFAULT_REGISTRY_DIR, cache_bytes=DEFAULT_CACHE_BYTES):
+        self.root = os.path.abspath(root)
+        self.objects_dir = os.path.join(self.root, "objects")  # Artifacts, named by content hash
+        self.index_path = os.path.join(self.root, "index.json")  # name -> metadata
+        self.lock_path = os.path.join(self.root, "index.lock")  # Serializes index updates across processes
+        self.cache_bytes = cache_bytes  # Memory cap for deserialized models (estimated by artifact size)
+        self._cache = OrderedDict()  # key -> (model, size), least recently used first
+        self._cached_bytes = 0
+        self._lock = threading.RLock()
+        os.makedirs(self.objects_dir, exist_ok=True)
+
+    def artifact_path(self, digest):
+        # Location of the artifact with the given content hash
+        return os.path.join(self.objects_dir, f"{digest}.pkl")
+
+    def _read_index(self):
+        if not os.path.exists(self.index_path):
+            return {}
+        with open(self.index_path) as f:
+            return json.load(f)
+
+    def _write_index(self, index):
+        # Write to a temporary file and rename, so readers never see a partial index
+        fd, tmp = tempfile.mkstemp(dir=self.root, suffix=".json")
+        with os.fdopen(fd, "w") as f:
+            json.dump(index, f, indent=2, default=str)
+        os.replace(tmp, self.index_path)
+
+    @contextmanager
+    def _index_lock(self):
+        # Held around every read-modify-write of the index. The thread lock covers this process;
+        # the file lock covers other processes saving to the same registry (training job
+        # workers, batch jobs), which would otherwise overwrite each other's new entries.
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            with open(self.lock_path, "a") as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def check_name(self, name):
+        # Raise ValueError if `name` can't be registered: names ending in .pkl are read as file
+        # paths, and a name shared with a loose <name>.pkl would shadow that file in load()
+        if name.endswith(".pkl"):
+            raise ValueError(f"Model name {name!r} must not end in .pkl")
+        if os.path.isfile(f"{name}.pkl"):
+            raise ValueError(f"Model name {name!r} is taken by {name}.pkl; choose another name")
+
+    def save(self, name, model, metrics=None, feature_schema=None, data_fingerprint=None, mmap=False):
+        # Store a model under `name`; identical artifacts are stored only once
+        self.check_name(name)
+        fd, tmp = tempfile.mkstemp(dir=self.objects_dir, suffix=".tmp")
+        os.close(fd)
+        try:
+            joblib.dump(model, tmp)  # Serialize once, uncompressed so arrays stay memory-mappable
+            digest = file_fingerprint(tmp)
+            path = self.artifact_path(digest)
+            if os.path.exists(path):
+                os.remove(tmp)  # Same content already stored
+            else:
+                os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        entry = {
+            "name": name,
+            "hash": digest,  # SHA-256 of the artifact; the file is objects/<hash>.pkl
+            "size_bytes": os.path.getsize(path),
+            "created_at": time.time(),
+            "feature_schema": feature_schema,  # Input column -> dtype
+            "metrics": metrics,  # Evaluation metrics from training
+            "data_fingerprint": data_fingerprint,  # SHA-256 of the training data
+            "mmap": bool(mmap),  # Load with memory-mapped arrays
+        }
+        with self._index_lock():
+            index = self._read_index()
+            index[name] = entry
+            self._write_index(index)
+            self._put(("hash", digest), model, entry["size_bytes"])  # Freshly trained model is warm
+        return dict(entry, path=path)
+
+    def list(self):
+        # Metadata of all registered models
+        with self._lock:
+            return [dict(e, path=self.artifact_path(e["hash"])) for e in self._read_index().values()]
+
+    def get(self, name):
+        # Metadata of one registered model (with its artifact path), or None
+        with self._lock:
+            entry = self._read_index().get(name)
+        return dict(entry, path=self.artifact_path(entry["hash"])) if entry is not None else None
+
+    def load(self, ref, mmap_mode=None):
+        # Load a model by registered name, or by path to a loose .pkl file (e.g. "model.pkl",
+        # or "model" when no model of that name is registered); refs ending in .pkl are always
+        # file paths. Repeated loads are served from the cache. mmap_mode="r" memory-maps
+        # the arrays; models registered with mmap=True use it by default.
+        entry = None if ref.endswith(".pkl") else self.get(ref)
+        if entry is not None:
+            key, path = ("hash", entry["hash"]), entry["path"]
+            if mmap_mode is None and entry.get("mmap"):
+                mmap_mode = "r"
+        else:
+            path = ref if os.path.isfile(ref) else f"{ref}.pkl"
+            if not os.path.isfile(path):
+                raise KeyError(f"No registered model or file named {ref!r}")
+            stat = os.stat(path)
+            key = ("file", os.path.abspath(path), stat.st_mtime_ns, stat.st_size)  # Reloaded if the file changes
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)  # Mark as most recently used
+                return self._cache[key][0]
+        model = joblib.load(path, mmap_mode=mmap_mode)  # Deserialize outside the lock
+        with self._lock:
+            self._put(key, model, os.path.getsize(path))
+        return model
+
+    def _put(self, key, model, size):
+        if key in self._cache:
+            self._cached_bytes -= self._cache.pop(key)[1]
+        self._cache[key] = (model, size)
+        self._cached_bytes += size
+        while self._cached_bytes > self.cache_bytes and len(self._cache) > 1:  # Evict least recently used
+            _, (_, evicted) = self._cache.popitem(last=False)
+            self._cached_bytes -= evicted
+
+    def clear_cache(self):
+        with self._lock:
+            self._cache.clear()
+            self._cached_bytes = 0
+
+
+_registries = {}  # One registry (and cache) per root and process
+_registries_lock = threading.Lock()
+
+
+def get_registry(root=DEFAULT_REGISTRY_DIR, **kwargs):
+    # Process-wide registry for `root`
+    root = os.path.abspath(root)  # Relative roots are pinned to the working directory at first use
+    with _registries_lock:
+        if root not in _registries:
+            _registries[root] = ModelRegistry(root, **kwargs)
+        return _registries[root]
+
+
+def load_model(ref, root=DEFAULT_REGISTRY_DIR, mmap_mode=None):
+    # Load a model by registered name or file path through the shared cache
+    return get_registry(root).load(ref, mmap_mode=mmap_mode)
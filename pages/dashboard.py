@@ -1,41 +1,76 @@
 import streamlit as st  # Import Streamlit for building the web dashboard
-import pandas as pd  # Import pandas for data manipulation
 import plotly.express as px  # Import Plotly Express for interactive charts
+import os  # For checking whether the prediction log exists
+from prediction_log import DEFAULT_LOG_PATH, count_categories, read_aggregates  # Pre-aggregated approval counters
+from loan_schema import read_loans, value_labels  # Typed loading of coded or labelled loan CSVs
+import instrumentation  # Loader timings
+
+instrumentation.configure_from_env()  # Metrics export, if enabled (started once per process)
 
 st.set_page_config(layout="wide")  # Set the Streamlit page layout to wide for more space
 st.title("Loan Approval Analytics Dashboard")  # Set the dashboard title at the top of the page
 
 @st.cache_data  # Cache the function output to avoid reloading data on every interaction
 def load_data(uploaded_file):
-    return pd.read_csv(uploaded_file)  # Read the uploaded CSV file into a pandas DataFrame
+    with instrumentation.timer("loan_dashboard_load_seconds", loader="load_data"):
+        return read_loans(uploaded_file)  # Read the uploaded CSV with categories and float32 numerics
 
-uploaded_file = st.file_uploader("Upload a CSV file", type=["csv"])  # File uploader widget for CSV files
-if uploaded_file is not None:  # If a file has been uploaded by the user
-    df = load_data(uploaded_file)  # Load the CSV data into a DataFrame
+@st.cache_data  # Counting an uploaded file is done once per file
+def load_counts(uploaded_file):
+    with instrumentation.timer("loan_dashboard_load_seconds", loader="load_counts"):
+        return count_categories(load_data(uploaded_file))  # Vectorized approval counts per category
 
-    # Decode values: convert encoded numerical values to human-readable strings for display
-    df['Gender'] = df['Gender'].map({0: "Female", 1: "Male"})  # Map 0/1 to Female/Male
-    df['Married'] = df['Married'].map({0: "No", 1: "Yes"})  # Map 0/1 to No/Yes
-    df['Dependents'] = df['Dependents'].map({0: "0", 1: "1", 2: "2", 3: "3+"})  # Map 0/1/2/3 to 0/1/2/3+
-    df['Education'] = df['Education'].map({0: "Not Graduate", 1: "Graduate"})  # Map 0/1 to Not Graduate/Graduate
-    df['Self_Employed'] = df['Self_Employed'].map({0: "No", 1: "Yes"})  # Map 0/1 to No/Yes
-    df['Loan_Status'] = df['Loan_Status'].map({0: "N", 1: "Y"})  # Map 0/1 to N/Y (No/Yes)
+@st.cache_data(ttl=10)  # Re-query the prediction log at most every 10 seconds
+def load_log_counts(path):
+    with instrumentation.timer("loan_dashboard_load_seconds", loader="load_log_counts"):
+        return read_aggregates(path)  # Running counters: O(number of categories) rows, no log scan
 
-    # Define a function to calculate approval rate for a given column
-    def approval_rate(df, col):
+counts = None  # Approval counts per (column, value), from the prediction log or an uploaded file
+source = st.radio("Data source", ["Prediction log", "Upload a CSV"], horizontal=True)  # Choose where the data comes from
+if source == "Prediction log":  # Read the counters maintained by the prediction log
+    if os.path.exists(DEFAULT_LOG_PATH):
+        counts = load_log_counts(DEFAULT_LOG_PATH)  # Load the pre-aggregated counts
+    else:  # No predictions logged yet
+        st.info("📭 No prediction log yet. Make a prediction, or import predicted_data.csv with `python prediction_log.py`.")
+else:
+    uploaded_file = st.file_uploader("Upload a CSV file", type=["csv"])  # File uploader widget for CSV files
+    if uploaded_file is not None:  # If a file has been uploaded by the user
+        counts = load_counts(uploaded_file)  # Count the CSV data once
+    else:  # If no file has been uploaded yet
+        st.info("📤 Please upload a CSV file to continue.")  # Show an info message prompting the user to upload a file
+
+if counts is not None:  # If there is data to show
+
+    # Decode values: numeric codes (prediction log) and labels (uploaded train.csv-style
+    # files) both map to the human-readable label from the shared loan schema
+    labels = {
+        col: value_labels(col)
+        for col in ('Gender', 'Married', 'Dependents', 'Education', 'Self_Employed', 'Loan_Status')
+    }
+
+    # Counters of one column, keyed by its decoded label
+    def column_counts(counts, col):
+        c = counts[counts['column'] == col]  # Rows for the specified column
         return (
-            df.groupby(col)['Loan_Status']  # Group by the specified column
-            .apply(lambda x: (x == 'Y').mean() * 100)  # Calculate percent of 'Y' (approved) in each group
-            .reset_index(name='Approval Rate (%)')  # Reset index and name the result column
+            c.assign(**{col: c['value'].map(labels[col])})  # Decode the values
+            .groupby(col)[['approved', 'total', 'loan_amount']].sum()  # Merge values sharing a label
+            .reset_index()
         )
 
+    # Define a function to calculate approval rate for a given column
+    def approval_rate(counts, col):
+        c = column_counts(counts, col)
+        c['Approval Rate (%)'] = c['approved'] / c['total'] * 100  # Percent approved in each group
+        return c[[col, 'Approval Rate (%)']]
+
     # Calculate approval rates for various features
-    gender_rates = approval_rate(df, 'Gender')  # Approval rate by gender
-    married_rates = approval_rate(df, 'Married')  # Approval rate by marital status
-    dependents_rates = approval_rate(df, 'Dependents')  # Approval rate by number of dependents
-    education_rates = approval_rate(df, 'Education')  # Approval rate by education level
-    self_emp_rates = approval_rate(df, 'Self_Employed')  # Approval rate by self-employment status
-    loan_amount_sums = df.groupby('Loan_Status')['LoanAmount'].sum().reset_index()  # Total loan amount by approval status
+    gender_rates = approval_rate(counts, 'Gender')  # Approval rate by gender
+    married_rates = approval_rate(counts, 'Married')  # Approval rate by marital status
+    dependents_rates = approval_rate(counts, 'Dependents')  # Approval rate by number of dependents
+    education_rates = approval_rate(counts, 'Education')  # Approval rate by education level
+    self_emp_rates = approval_rate(counts, 'Self_Employed')  # Approval rate by self-employment status
+    status_counts = column_counts(counts, 'Loan_Status')  # Counts and loan amounts by approval status
+    loan_amount_sums = status_counts[['Loan_Status', 'loan_amount']].rename(columns={'loan_amount': 'LoanAmount'})  # Total loan amount by approval status
 
     # Layout: create two columns for displaying charts side by side
     col1, col2 = st.columns(2)  # Split the page into two columns
@@ -50,8 +85,7 @@ if uploaded_file is not None:  # If a file has been uploaded by the user
         st.plotly_chart(fig2, use_container_width=True)  # Display the chart
 
         st.subheader("3️⃣ Loan Status Distribution (Pie Chart)")  # Subheader for loan status pie chart
-        loan_status_counts = df['Loan_Status'].value_counts().reset_index()  # Count number of each loan status
-        loan_status_counts.columns = ['Loan_Status', 'Count']  # Rename columns for clarity
+        loan_status_counts = status_counts[['Loan_Status', 'total']].rename(columns={'total': 'Count'})  # Number of each loan status
         fig3 = px.pie(loan_status_counts, names='Loan_Status', values='Count', title="Loan Status")  # Pie chart for loan status distribution
         st.plotly_chart(fig3, use_container_width=True)  # Display the chart
 
@@ -67,6 +101,3 @@ if uploaded_file is not None:  # If a file has been uploaded by the user
     # Optional: display a table of total loan amount by approval status
     st.subheader("💰 Total Loan Amount by Status")  # Subheader for loan amount table
     st.dataframe(loan_amount_sums.set_index('Loan_Status'))  # Show the table with loan status as index
-
-else:  # If no file has been uploaded yet
-    st.info("📤 Please upload a CSV file to continue.")  # Show an info message prompting the user to upload a file
\ No newline at end of file
@@ -1,10 +1,88 @@
 import streamlit as st  # Import Streamlit for building the web interface
 import pandas as pd  # Import pandas for data manipulation
-import tempfile  # Import tempfile for creating temporary files
-import pickle  # Import pickle for saving/loading Python objects (models)
 import plotly.express as px  # Import Plotly Express for charts
 import plotly.graph_objects as go  # Import Plotly Graph Objects for advanced charts
-from auto_ml import auto_train_model  # Import the auto_train_model function from auto_ml.py
+from training_jobs import get_job_queue, STAGES  # Background training jobs shared by all sessions
+from data_cache import get_training_cache  # Cache of parsed uploads and fitted preprocessing
+from model_registry import get_registry  # Model names are checked against loose .pkl files
+import instrumentation  # Training stage timings and metrics export
+
+instrumentation.configure_from_env()  # Metrics export, if enabled (started once per process)
+
+
+def show_results(job_id, model_name, metrics):
+    # Download link, leaderboard, charts and usage example of a finished training job
+    # (widget keys include the job id, so several results can be on the page)
+
+    # The model was stored once in the model registry by auto_train_model
+    pickle_file = f"{model_name}.pkl"  # Download name for the model file
+
+    # Download button for the trained model (only saved models have a file)
+    if metrics.get("model_path"):
+        st.download_button("📥 Download Model (.pkl)", data=open(metrics["model_path"], "rb"), file_name=pickle_file, key=f"download-{job_id}")
+
+    # Model search leaderboard, best candidate first
+    if metrics.get('leaderboard'):
+        st.subheader("🏆 Model Search Leaderboard")  # Subheader for leaderboard
+        leaderboard_df = pd.DataFrame(metrics['leaderboard'])  # One row per candidate configuration
+        leaderboard_df['params'] = leaderboard_df['params'].astype(str)  # Show hyperparameters as text
+        st.dataframe(leaderboard_df)  # Display the leaderboard
+
+    # Charts section for model metrics
+    st.subheader("📊 Model Metrics")  # Subheader for metrics
+
+    if metrics.get('accuracy') is not None:  # If accuracy is available
+        accuracy = metrics['accuracy']  # Get accuracy value
+        fig_gauge = go.Figure(go.Indicator(  # Create a gauge chart for accuracy
+            mode="gauge+number",
+            value=accuracy * 100,
+            title={'text': "Accuracy (%)"},
+            gauge={'axis': {'range': [None, 100]}}
+        ))
+        st.plotly_chart(fig_gauge, use_container_width=True, key=f"gauge-{job_id}")  # Display the gauge chart
+    else:  # If accuracy is not available
+        st.info("⚠️ Accuracy not available (test set may lack target).")  # Show info message
+
+    if metrics.get('classification_report') is not None:  # If classification report is available
+        report_df = pd.DataFrame(metrics['classification_report']).transpose()  # Convert report to DataFrame
+        st.subheader("📄 Classification Report")  # Subheader for report
+        st.dataframe(report_df)  # Display the report as a table
+
+        # Bar chart for precision, recall, f1-score
+        fig_bar = px.bar(
+            report_df.reset_index().melt(id_vars="index", value_vars=["precision", "recall", "f1-score"]),
+            x="index", y="value", color="variable",
+            labels={"index": "Class", "value": "Score", "variable": "Metric"},
+            barmode="group",
+            title="Classification Metrics"
+        )
+        st.plotly_chart(fig_bar, use_container_width=True, key=f"report-{job_id}")  # Display the bar chart
+    else:  # If classification report is not available
+        st.info("⚠️ Classification report not available.")  # Show info message
+
+    if not metrics.get("model_path"):  # Not saved, so there is nothing to load
+        return
+
+    # Developer Code Block: show how to use the trained model
+    st.subheader("🧠 How to Use the Trained Model")  # Subheader for code block
+
+    code = f"""
+from model_registry import load_model
+
+# Load the model by name from the model registry (cached after the first load)
+model = load_model("{model_name}")
+
+# Or load the downloaded file directly
+# import joblib
+# model = joblib.load("{pickle_file}")
+
+# Example prediction
+# input_data must be a pandas DataFrame with same features used in training;
+# categorical fields may be labels ("Male") or numeric codes (1), as in the training file
+# prediction = model.predict(input_data)
+"""
+    st.code(code, language="python")  # Display the code block in Python syntax
+
 
 st.title("Loan AutoML Model Trainer")  # Set the page title in Streamlit
 
@@ -34,85 +112,73 @@ if uploaded:  # If at least one file is uploaded
 
     model_name = st.text_input("Enter model name", value="my_model")  # Text input for model name (default: my_model)
 
-    if st.button("Train Model"):  # If user clicks the Train Model button
-        with st.spinner("Training..."):  # Show a spinner while training
-            if len(uploaded) == 2:  # If two files (train/test) are used
-                tfile = tempfile.NamedTemporaryFile(delete=False, suffix=".csv")  # Create temp file for train data
-                tfile.write(file_map[train_name].getvalue())  # Write train file content to temp file
-                tfile.flush()  # Flush to disk
-                xfile = tempfile.NamedTemporaryFile(delete=False, suffix=".csv")  # Create temp file for test data
-                xfile.write(file_map[test_name].getvalue())  # Write test file content to temp file
-                xfile.flush()  # Flush to disk
-                pipeline, metrics = auto_train_model(  # Call auto_train_model with train and test paths
-                    train_path=tfile.name,
-                    test_path=xfile.name,
-                    target_column=target,
-                    model_name=model_name
-                )
-            else:  # If only one file is used (full dataset)
-                tfile = tempfile.NamedTemporaryFile(delete=False, suffix=".csv")  # Create temp file for data
-                tfile.write(uploaded[0].getvalue())  # Write file content to temp file
-                tfile.flush()  # Flush to disk
-                pipeline, metrics = auto_train_model(  # Call auto_train_model with full_path
-                    full_path=tfile.name,
-                    target_column=target,
-                    model_name=model_name
-                )
-
-        st.success(f"✅ Model '{model_name}' trained successfully!")  # Show success message
-
-        # Save pickle file
-        pickle_file = f"{model_name}.pkl"  # Name for the pickle file
-        with open(pickle_file, "wb") as f:  # Open file for writing in binary mode
-            pickle.dump(pipeline, f)  # Save the trained pipeline to the file
-
-        # Download button for the trained model
-        st.download_button("📥 Download Model (.pkl)", data=open(pickle_file, "rb"), file_name=pickle_file)
-
-        # Charts section for model metrics
-        st.subheader("📊 Model Metrics")  # Subheader for metrics
-
-        if metrics.get('accuracy') is not None:  # If accuracy is available
-            accuracy = metrics['accuracy']  # Get accuracy value
-            fig_gauge = go.Figure(go.Indicator(  # Create a gauge chart for accuracy
-                mode="gauge+number",
-                value=accuracy * 100,
-                title={'text': "Accuracy (%)"},
-                gauge={'axis': {'range': [None, 100]}}
-            ))
-            st.plotly_chart(fig_gauge, use_container_width=True)  # Display the gauge chart
-        else:  # If accuracy is not available
-            st.info("⚠️ Accuracy not available (test set may lack target).")  # Show info message
-
-        if metrics.get('classification_report') is not None:  # If classification report is available
-            report_df = pd.DataFrame(metrics['classification_report']).transpose()  # Convert report to DataFrame
-            st.subheader("📄 Classification Report")  # Subheader for report
-            st.dataframe(report_df)  # Display the report as a table
-
-            # Bar chart for precision, recall, f1-score
-            fig_bar = px.bar(
-                report_df.reset_index().melt(id_vars="index", value_vars=["precision", "recall", "f1-score"]),
-                x="index", y="value", color="variable",
-                labels={"index": "Class", "value": "Score", "variable": "Metric"},
-                barmode="group",
-                title="Classification Metrics"
-            )
-            st.plotly_chart(fig_bar, use_container_width=True)  # Display the bar chart
-        else:  # If classification report is not available
-            st.info("⚠️ Classification report not available.")  # Show info message
-
-        # Developer Code Block: show how to use the trained model
-        st.subheader("🧠 How to Use the Trained Model")  # Subheader for code block
-
-        code = f"""
-import pickle
-
-# Load the model
-with open("{pickle_file}", "rb") as f:
-    model = pickle.load(f)
+    # Training mode: default logistic regression, cross-validated model search, or out-of-core streaming
+    mode = st.radio("Training mode", ["Standard", "Model search (cross-validated)", "Streaming (larger than memory)"])
+    search_options = {}  # Extra keyword arguments for auto_train_model
+    if mode.startswith("Model search"):
+        search_options["search"] = True
+        search_options["cv"] = st.slider("Cross-validation folds", 2, 10, 5)  # Number of CV folds
+        budget = st.number_input("Time budget in seconds (0 = no limit)", min_value=0, value=120)  # Search time limit
+        search_options["time_budget"] = budget or None
+    elif mode.startswith("Streaming"):
+        search_options["streaming"] = True
+        search_options["chunksize"] = st.number_input("Rows per chunk", min_value=1000, value=100_000, step=10_000)  # Memory bound
+        search_options["epochs"] = st.slider("Passes over the data", 1, 20, 5)  # partial_fit epochs
 
-# Example prediction
-# input_data must be a pandas DataFrame with same features used in training
-# prediction = model.predict(input_data)
-"""
-        st.code(code, language="python")  # Display the code block in Python syntax
\ No newline at end of file
+    if st.button("Train Model"):  # If user clicks the Train Model button
+        if not model_name.strip():  # The model is saved and downloaded under this name
+            st.error("Enter a model name.")
+            st.stop()
+        try:
+            get_registry().check_name(model_name)  # Don't shadow a loose .pkl such as model.pkl
+        except ValueError as exc:
+            st.error(str(exc))
+            st.stop()
+        if not search_options.get("streaming"):  # Parsed data and preprocessing are reused on retraining
+            search_options["cache"] = get_training_cache()
+        # Training runs in a background worker process; the uploads are handed over as bytes
+        if len(uploaded) == 2:  # If two files (train/test) are used
+            files = {"train_path": file_map[train_name].getvalue(), "test_path": file_map[test_name].getvalue()}
+        else:  # If only one file is used (full dataset)
+            files = {"full_path": uploaded[0].getvalue()}
+        job_id = get_job_queue().submit(files=files, target_column=target, model_name=model_name, **search_options)
+        st.session_state.setdefault("training_jobs", []).append(job_id)  # Polled below
+
+
+job_queue = get_job_queue()  # Shared by all sessions; at most two jobs train at a time
+job_ids = st.session_state.get("training_jobs", [])  # This session's jobs, oldest first
+jobs = [job for job in (job_queue.status(i) for i in reversed(job_ids)) if job is not None]  # Expired ones dropped
+
+
+@st.fragment(run_every=1)  # Polls every second without rerunning the rest of the page
+def show_progress(active_ids):
+    # Progress of the jobs that were queued or running when the page last ran
+    for job_id in active_ids:
+        job = job_queue.status(job_id)
+        if job is None or job["status"] not in ("queued", "running"):
+            st.rerun()  # Finished: rerun the whole page to show its results
+        name = job["model_name"] or job_id
+        if job["status"] == "queued":
+            st.info(f"⏳ '{name}' is waiting for a free worker...")
+        else:
+            stage = job["stage"] or STAGES[0]
+            st.progress(STAGES.index(stage) / len(STAGES), text=f"Training '{name}': {stage}...")
+        if st.button("Cancel", key=f"cancel-{job_id}"):
+            job_queue.cancel(job_id)  # A running job stops at its next stage
+
+
+active = [job["id"] for job in jobs if job["status"] in ("queued", "running")]
+if active:
+    show_progress(active)
+
+# Results of finished jobs, newest first
+for job in jobs:
+    name = job["model_name"] or job["id"]
+    if job["status"] == "done":
+        st.divider()
+        st.success(f"✅ Model '{name}' trained successfully!")  # Show success message
+        show_results(job["id"], name, job["metrics"])
+    elif job["status"] == "failed":
+        st.error(f"Training of '{name}' failed: {job['error']}")
+    elif job["status"] == "cancelled":
+        st.warning(f"Training of '{name}' was cancelled.")
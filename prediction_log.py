@@ -0,0 +1,252 @@
+import atexit  # For flushing buffered rows when the process exits
+import csv  # For importing the legacy predicted_data.csv
+import sqlite3  # Append-friendly local store (WAL mode allows concurrent readers and writers)
+import threading  # For the buffer lock and the periodic flush thread
+import time  # For flush intervals and row timestamps
+import pandas as pd  # For the reader API
+
+# Columns of a logged prediction, in the same order as predicted_data.csv
+LOG_COLUMNS = [
+    "Gender", "Married", "Dependents", "Education", "Self_Employed", "ApplicantIncome",
+    "CoapplicantIncome", "LoanAmount", "Loan_Amount_Term", "Credit_History", "Property_Area",
+    "Loan_Status",
+]
+_REAL_COLUMNS = {"CoapplicantIncome", "LoanAmount", "Loan_Amount_Term", "Credit_History"}  # Stored as floats
+
+# Columns with running approval counters, kept up to date on every flush
+AGGREGATE_COLUMNS = ["Gender", "Married", "Dependents", "Education", "Self_Employed", "Property_Area", "Loan_Status"]
+_STATUS_INDEX = 1 + LOG_COLUMNS.index("Loan_Status")  # Positions in a buffered record (after logged_at)
+_AMOUNT_INDEX = 1 + LOG_COLUMNS.index("LoanAmount")
+_AGGREGATE_INDEX = [(c, 1 + LOG_COLUMNS.index(c)) for c in AGGREGATE_COLUMNS]
+
+DEFAULT_LOG_PATH = "predictions.db"  # Default location of the prediction log
+
+
+class PredictionLog:
+    # Buffered prediction log backed by SQLite in WAL mode. Rows are kept in memory and
+    # written in one transaction once `flush_size` rows are waiting or `flush_interval`
+    # seconds have passed, instead of opening a file for every prediction.
+    def __init__(self, path=DEFAULT_LOG_PATH, flush_size=100, flush_interval=5.0):
+        self.path = path
+        self.flush_size = flush_size  # Flush once this many rows are buffered
+        self.flush_interval = flush_interval  # Flush at least this often (seconds) while rows are waiting
+        self._buffer = []  # Rows not yet written to disk
+        self._lock = threading.Lock()  # Guards the buffer and the connection
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")  # Writers don't block readers
+        self._conn.execute("PRAGMA synchronous=NORMAL")  # Safe with WAL, far fewer fsyncs
+        cols = ", ".join(f"{c} {'REAL' if c in _REAL_COLUMNS else 'INTEGER'}" for c in LOG_COLUMNS)
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS predictions (id INTEGER PRIMARY KEY AUTOINCREMENT, logged_at REAL, {cols})"
+        )
+        # Materialized approval counts per (column, value); the dashboard reads only this table
+        created = not self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'approval_counts'"
+        ).fetchone()
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS approval_counts (column TEXT, value, approved INTEGER, total INTEGER,"
+            " loan_amount REAL, PRIMARY KEY (column, value))"
+        )
+        self._conn.commit()
+        if created:  # Logs created before the counters existed are backfilled once
+            rebuild_aggregates(self._conn)
+        self._stop = threading.Event()
+        self._flusher = None
+        if flush_interval:  # Background thread for time-based flushes
+            self._flusher = threading.Thread(target=self._flush_periodically, daemon=True)
+            self._flusher.start()
+        atexit.register(self.close)
+
+    def append(self, row):
+        # Buffer one prediction (a dict with the LOG_COLUMNS keys)
+        record = (time.time(),) + tuple(_plain(row.get(c)) for c in LOG_COLUMNS)
+        with self._lock:
+            self._buffer.append(record)
+            full = len(self._buffer) >= self.flush_size
+        if full:
+            self.flush()
+
+    def extend(self, rows):
+        # Buffer many predictions at once
+        now = time.time()
+        records = [(now,) + tuple(_plain(row.get(c)) for c in LOG_COLUMNS) for row in rows]
+        with self._lock:
+            self._buffer.extend(records)
+            full = len(self._buffer) >= self.flush_size
+        if full:
+            self.flush()
+
+    def flush(self):
+        # Write all buffered rows in a single transaction
+        with self._lock:
+            if not self._buffer:
+                return 0
+            rows, self._buffer = self._buffer, []
+            placeholders = ", ".join("?" * (len(LOG_COLUMNS) + 1))
+            try:
+                with self._conn:  # Commits, or rolls back on error
+                    self._conn.executemany(
+                        f"INSERT INTO predictions (logged_at, {', '.join(LOG_COLUMNS)}) VALUES ({placeholders})",
+                        rows,
+                    )
+                    _update_aggregates(self._conn, rows)  # Same transaction, so counters never drift
+            except sqlite3.Error:  # Busy/locked, or a value sqlite3 can't bind
+                self._buffer[:0] = rows  # Keep the rows for the next flush
+                raise
+            return len(rows)
+
+    def _flush_periodically(self):
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except sqlite3.Error:
+                pass  # Database busy or locked; the rows stay buffered for the next attempt
+
+    def read(self, columns=None, since_id=None, limit=None):
+        # Return logged predictions as a DataFrame (buffered rows are flushed first)
+        self.flush()
+        return read_log(self.path, columns=columns, since_id=since_id, limit=limit)
+
+    def close(self):
+        self._stop.set()
+        try:
+            self.flush()
+        except sqlite3.ProgrammingError:
+            return  # Already closed
+        with self._lock:
+            self._conn.close()
+
+
+def read_log(path=DEFAULT_LOG_PATH, columns=None, since_id=None, limit=None):
+    # Read predictions from a log file without opening a writer
+    cols = ", ".join(["id", "logged_at"] + list(columns or LOG_COLUMNS))
+    query = f"SELECT {cols} FROM predictions"
+    params = []
+    if since_id is not None:  # Only rows logged after a known id
+        query += " WHERE id > ?"
+        params.append(since_id)
+    query += " ORDER BY id"
+    if limit is not None:
+        query += " LIMIT ?"
+        params.append(limit)
+    with sqlite3.connect(path, timeout=30) as conn:
+        return pd.read_sql_query(query, conn, params=params, index_col="id")
+
+
+def _update_aggregates(conn, rows):
+    # Add a batch of buffered records to the running counters
+    counts = {}  # (column, value) -> [approved, total, loan_amount]
+    for row in rows:
+        approved = 1 if row[_STATUS_INDEX] == 1 else 0
+        amount = row[_AMOUNT_INDEX] or 0.0
+        for col, i in _AGGREGATE_INDEX:
+            if row[i] is None:  # Missing values are not counted, like groupby
+                continue
+            counter = counts.setdefault((col, row[i]), [0, 0, 0.0])
+            counter[0] += approved
+            counter[1] += 1
+            counter[2] += amount
+    conn.executemany(
+        "INSERT INTO approval_counts (column, value, approved, total, loan_amount) VALUES (?, ?, ?, ?, ?)"
+        " ON CONFLICT (column, value) DO UPDATE SET approved = approved + excluded.approved,"
+        " total = total + excluded.total, loan_amount = loan_amount + excluded.loan_amount",
+        [(col, value, *counter) for (col, value), counter in counts.items()],
+    )
+
+
+def rebuild_aggregates(conn):
+    # Recompute all counters from the full log with one GROUP BY per column (done inside SQLite)
+    with conn:
+        conn.execute("DELETE FROM approval_counts")
+        for col in AGGREGATE_COLUMNS:
+            conn.execute(
+                f"INSERT INTO approval_counts (column, value, approved, total, loan_amount)"
+                f" SELECT ?, {col}, SUM(Loan_Status = 1), COUNT(*), TOTAL(LoanAmount)"
+                f" FROM predictions WHERE {col} IS NOT NULL GROUP BY {col}",
+                (col,),
+            )
+
+
+def read_aggregates(path=DEFAULT_LOG_PATH):
+    # Approval counters as a DataFrame with columns: column, value, approved, total, loan_amount
+    with sqlite3.connect(path, timeout=30) as conn:
+        return pd.read_sql_query(
+            "SELECT column, value, approved, total, loan_amount FROM approval_counts ORDER BY column, value", conn
+        )
+
+
+def count_categories(df, columns=AGGREGATE_COLUMNS):
+    # Same counters as read_aggregates, computed from a DataFrame with vectorized groupbys;
+    # works on the numeric-coded log form and on loan_schema frames (categories)
+    approved = df["Loan_Status"].isin([1, "Y"]).astype(int)
+    amount = df["LoanAmount"].astype(float).fillna(0.0)  # Sum in float64 even for float32 input
+    frames = []
+    for col in columns:
+        if col not in df.columns:
+            continue
+        keys = df[col]
+        frames.append(pd.DataFrame({
+            "approved": approved.groupby(keys, observed=True).sum(),
+            "total": keys.groupby(keys, observed=True).size(),
+            "loan_amount": amount.groupby(keys, observed=True).sum(),
+        }).rename_axis("value").reset_index().assign(column=col))
+    return pd.concat(frames, ignore_index=True)[["column", "value", "approved", "total", "loan_amount"]]
+
+
+def import_csv(csv_path, log, chunksize=10_000):
+    # One-time migration of predicted_data.csv into the log. Rows written with the pandas
+    # index (13 fields) and rows appended without it (12 fields) are both accepted.
+    imported = 0
+    with open(csv_path, newline="") as f:
+        reader = csv.reader(f)
+        next(reader, None)  # Skip the header
+        batch = []
+        for fields in reader:
+            if not fields:
+                continue
+            values = fields[-len(LOG_COLUMNS):]  # Drop the leading index column if present
+            batch.append({c: _number(v) for c, v in zip(LOG_COLUMNS, values)})
+            if len(batch) >= chunksize:
+                log.extend(batch)
+                imported += len(batch)
+                batch = []
+        if batch:
+            log.extend(batch)
+            imported += len(batch)
+    log.flush()
+    return imported
+
+
+def _plain(value):
+    # sqlite3 can't bind NumPy scalars; convert them to Python numbers
+    return value.item() if hasattr(value, "item") else value
+
+
+def _number(value):
+    if value == "":
+        return None
+    number = float(value)
+    return int(number) if number.is_integer() else number
+
+
+_logs = {}  # One shared log per path and process
+_logs_lock = threading.Lock()
+
+
+def get_prediction_log(path=DEFAULT_LOG_PATH, **kwargs):
+    # Process-wide PredictionLog for `path`, so every session shares one buffer
+    with _logs_lock:
+        if path not in _logs:
+            _logs[path] = PredictionLog(path, **kwargs)
+        return _logs[path]
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Import a legacy prediction CSV into the prediction log.")
+    parser.add_argument("csv", nargs="?", default="predicted_data.csv", help="CSV to import")
+    parser.add_argument("--db", default=DEFAULT_LOG_PATH, help="Prediction log database")
+    args = parser.parse_args()
+    log = PredictionLog(args.db, flush_interval=0)
+    print(f"Imported {import_csv(args.csv, log)} rows from {args.csv} into {args.db}")
+    log.close()
@@ -0,0 +1,216 @@
+import argparse  # For the command-line interface
+import asyncio  # For the event loop serving many connections at once
+import json  # For decoding requests and encoding responses
+import time  # For timing the batching window
+from model_registry import load_model  # For loading the model once at startup
+import pandas as pd  # For turning a batch of JSON applications into a DataFrame
+from batch_score import categorical_columns, score_chunk  # Shared vectorized scoring helpers
+from loan_schema import check_application  # For rejecting bad applications before they are batched
+
+
+class MicroBatcher:
+    # Coalesces concurrent prediction requests into small batches so the sklearn pipeline
+    # is called once per batch instead of once per request
+    def __init__(self, model, batch_window=0.005, max_batch_size=64):
+        self.model = model  # Warm model, loaded once and shared by all requests
+        self.batch_window = batch_window  # Seconds to wait for more requests after the first one
+        self.max_batch_size = max_batch_size  # Flush early once this many rows are queued
+        self.features = list(model.feature_names_in_) if hasattr(model, "feature_names_in_") else None
+        self.cat_cols = categorical_columns(model)  # Columns that must be passed as strings
+        self.queue = asyncio.Queue()  # Pending (record, future) pairs
+        self.batches = 0  # Number of pipeline calls made
+        self.rows = 0  # Number of rows scored
+        self._worker = None
+
+    def start(self):
+        self._worker = asyncio.create_task(self._run())  # Background task draining the queue
+
+    async def stop(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+
+    async def predict(self, record):
+        # Queue one application and wait for its result
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((record, future))
+        return await future
+
+    def _frame(self, records):
+        # Build the model input for a batch; unknown keys are dropped, missing ones become NaN
+        df = pd.DataFrame(records, columns=self.features)
+        for col in self.cat_cols:  # Same string typing as the batch scorer
+            df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+        return df
+
+    def _score(self, records):
+        df = self._frame(records)
+        return score_chunk(self.model, df).to_dict(orient="records")
+
+    def _score_each(self, records):
+        # Fallback for a failed batch: score every record on its own, so only the record
+        # that caused the failure gets the error (returned in place of its result)
+        results = []
+        for record in records:
+            try:
+                results.append(self._score([record])[0])
+            except Exception as exc:
+                results.append(exc)
+        return results
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]  # Block until the first request arrives
+            deadline = time.perf_counter() + self.batch_window
+            while len(batch) < self.max_batch_size:  # Collect more requests within the window
+                timeout = deadline - time.perf_counter()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            while len(batch) < self.max_batch_size and not self.queue.empty():  # Take whatever is already waiting
+                batch.append(self.queue.get_nowait())
+
+            records = [record for record, _ in batch]
+            try:
+                # Run the pipeline in a thread so the loop keeps accepting requests meanwhile
+                results = await loop.run_in_executor(None, self._score, records)
+            except Exception:  # A bad record must not fail the unrelated requests batched with it
+                results = await loop.run_in_executor(None, self._score_each, records)
+            self.batches += 1
+            self.rows += len(batch)
+            for (_, future), result in zip(batch, results):
+                if future.done():  # The client may have disconnected meanwhile
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+
+def _validate(record):
+    # Check an application against the loan schema before it joins a batch; raises ValueError.
+    # Dict lookups only, so it adds microseconds to a request. Missing values are left to the
+    # pipeline's imputers.
+    check_application(record, allow_missing=True)
+
+
+def _format_result(result):
+    # Convert a scored row into the JSON response shape
+    decision = result.pop("prediction")
+    if hasattr(decision, "item"):  # NumPy scalars are not JSON serializable
+        decision = decision.item()
+    probabilities = {key[len("proba_"):]: float(value) for key, value in result.items()}
+    return {"decision": decision, "probabilities": probabilities}
+
+
+class PredictionServer:
+    # Minimal HTTP/1.1 server on top of asyncio streams (local use, no external services)
+    def __init__(self, batcher, host="127.0.0.1", port=8000):
+        self.batcher = batcher
+        self.host = host
+        self.port = port
+
+    async def handle(self, path, method, body):
+        # Route a request; returns (status, payload)
+        if method == "GET" and path == "/health":
+            return 200, {"status": "ok", "batches": self.batcher.batches, "rows": self.batcher.rows}
+        if method == "POST" and path == "/predict":
+            try:
+                payload = json.loads(body or b"null")
+            except json.JSONDecodeError:
+                return 400, {"error": "Request body must be JSON"}
+            if isinstance(payload, dict):  # Single application
+                try:
+                    _validate(payload)
+                except ValueError as exc:
+                    return 400, {"error": str(exc)}
+                return 200, _format_result(await self.batcher.predict(payload))
+            if isinstance(payload, list) and all(isinstance(p, dict) for p in payload):  # Several applications
+                for i, p in enumerate(payload):
+                    try:
+                        _validate(p)
+                    except ValueError as exc:
+                        return 400, {"error": f"Application {i}: {exc}"}
+                results = await asyncio.gather(*(self.batcher.predict(p) for p in payload))
+                return 200, [_format_result(r) for r in results]
+            return 400, {"error": "Expected a JSON object or a list of objects"}
+        return 404, {"error": f"No route for {method} {path}"}
+
+    async def _serve_connection(self, reader, writer):
+        try:
+            while True:  # Keep-alive: serve requests until the client closes
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:  # Read headers up to the blank line
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    key, _, value = line.decode("latin-1").partition(":")
+                    headers[key.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", 0))
+                body = await reader.readexactly(length) if length else b""
+
+                try:
+                    status, payload = await self.handle(path, method, body)
+                except Exception as exc:  # Report scoring errors instead of dropping the connection
+                    status, payload = 500, {"error": str(exc)}
+                data = json.dumps(payload).encode()
+                keep_alive = headers.get("connection", "keep-alive").lower() != "close"
+                writer.write(
+                    f"HTTP/1.1 {status} {'OK' if status == 200 else 'Error'}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass  # Malformed request or client went away
+        finally:
+            writer.close()
+
+    async def serve_forever(self):
+        self.batcher.start()
+        server = await asyncio.start_server(self._serve_connection, self.host, self.port)
+        print(f"Serving predictions on http://{self.host}:{self.port} (window={self.batcher.batch_window * 1000:g}ms, max batch={self.batcher.max_batch_size})")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            await self.batcher.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve loan predictions over HTTP with micro-batching.")
+    parser.add_argument("--model", default="my_model_1.pkl", help="Registered model name or path of a saved pipeline")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind (local only by default)")
+    parser.add_argument("--port", type=int, default=8000, help="Port to listen on")
+    parser.add_argument("--batch-window-ms", type=float, default=5.0, help="How long to wait to fill a batch")
+    parser.add_argument("--max-batch-size", type=int, default=64, help="Largest batch sent to the model")
+    args = parser.parse_args(argv)
+
+    model = load_model(args.model)  # Load once; every request reuses the warm model
+
+    async def run():
+        batcher = MicroBatcher(model, args.batch_window_ms / 1000, args.max_batch_size)
+        await PredictionServer(batcher, args.host, args.port).serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,21 @@
+import time  # For timing the what-if grid scoring
+import numpy as np  # For the what-if grid values
 import streamlit as st  # Import Streamlit for building the web app interface
-import joblib  # Import joblib for loading the trained machine learning model
-import pandas as pd  # Import pandas for data manipulation and saving predictions
+import plotly.express as px  # For the what-if charts
+from model_registry import load_model  # Model registry with an in-memory cache of loaded models
+from prediction_log import get_prediction_log  # Buffered, append-optimized prediction log
+from what_if import DURATIONS, what_if_grid, approval_boundary  # Vectorized sensitivity scoring
+import instrumentation  # Prediction latency histograms and counters
+from loan_schema import validate_application, to_codes  # Input validation against the shared loan schema
 
-# Load the trained machine learning model from the file "model.pkl"
-model = joblib.load("model.pkl")
+# Load the trained machine learning model from model.pkl (by path, never a registered name); cached across reruns
+model = load_model("model.pkl")
+
+# Shared prediction log; rows are buffered and written to SQLite in batches
+prediction_log = get_prediction_log()
+
+# Metrics export (LOAN_METRICS_PORT / LOAN_METRICS_FILE), started once per process
+instrumentation.configure_from_env()
 
 def run():
     # Set up the app title and header using custom HTML and Streamlit markdown
@@ -79,19 +91,28 @@ def run():
         if dur == 4:
             duration = 480  # 16 months = 480 days
 
-        # Prepare the features in the order expected by the model
-        features = [[gen, mar, dep, edu, emp, mon_income, co_mon_income, loan_amt, duration, cred, prop]]  # List of features for prediction
-        print(features)  # For debugging: print the features to the console
+        # Validate the inputs against the loan schema, then prepare them in the order expected by the model
+        application = {
+            "Gender": gen, "Married": mar, "Dependents": dep, "Education": edu, "Self_Employed": emp,
+            "ApplicantIncome": mon_income, "CoapplicantIncome": co_mon_income, "LoanAmount": loan_amt,
+            "Loan_Amount_Term": duration, "Credit_History": cred, "Property_Area": prop,
+        }
+        try:
+            features = to_codes(validate_application(application))[list(model.feature_names_in_)]  # Numeric codes, like model.pkl expects
+        except ValueError as exc:
+            st.error(f"Invalid input: {exc}")
+            st.stop()
+
+        # Make a prediction using the loaded model (timed; profiled when LOAN_PROFILE=1)
+        with instrumentation.profile_request("predict"), instrumentation.timer("loan_prediction_seconds"):
+            prediction = model.predict(features)  # Predict loan approval (0 or 1)
 
-        # Make a prediction using the loaded model
-        prediction = model.predict(features)  # Predict loan approval (0 or 1)
-        print(prediction)# For debugging
-        
         # Extract the predicted class (0 or 1) from the model's single-item output
         ans = int(prediction[0])
+        instrumentation.inc("loan_predictions_total", decision=ans)
 
 
-        # Save the input and prediction to CSV for record-keeping or analytics
+        # Save the input and prediction to the prediction log for record-keeping or analytics
         new_row = {
             "Gender": gen,  # Gender (numeric)
             "Married": mar,  # Marital status (numeric)
@@ -106,8 +127,7 @@ def run():
             "Property_Area": prop,  # Property area (numeric)
             "Loan_Status": ans  # Prediction result (0 or 1)
         }
-        df_new = pd.DataFrame([new_row])  # Create a DataFrame from the new row
-        df_new.to_csv("predicted_data.csv", mode='a', header=False, index=False)  # Append the new row to CSV file
+        prediction_log.append(new_row)  # Buffered append; flushed in batches by size or time
 
         # Display the result to the user based on the prediction
         if ans == 0:
@@ -119,5 +139,44 @@ def run():
                 "Hello " + fn + ' '+' Congratulations!! you will get the loan from Bank'  # Show success message if approved
             )
 
+    # What-if analysis: score a whole grid of incomes, loan amounts and durations for this
+    # applicant in one batched call and show where the decision flips
+    with st.expander("What-if analysis"):
+        income_range = st.slider("Applicant income range ($)", 0, 100000, (0, 50000), step=500)  # Incomes to try
+        income_steps = st.number_input("Income values", min_value=2, max_value=5000, value=1000)  # Grid resolution
+        amount_range = st.slider("Loan amount range", 0, 2000, (50, 1000), step=10)  # Loan amounts to try
+        amount_steps = st.number_input("Loan amount values", min_value=2, max_value=200, value=20)  # Grid resolution
+        if st.button("Run what-if"):
+            applicant = {  # Current form values; the three grid columns are overwritten
+                "Gender": gen, "Married": mar, "Dependents": dep, "Education": edu, "Self_Employed": emp,
+                "ApplicantIncome": mon_income, "CoapplicantIncome": co_mon_income, "LoanAmount": loan_amt,
+                "Loan_Amount_Term": DURATIONS[dur], "Credit_History": cred, "Property_Area": prop,
+            }
+            start = time.perf_counter()
+            grid = what_if_grid(
+                model, applicant,
+                incomes=np.linspace(*income_range, int(income_steps)),
+                loan_amounts=np.linspace(*amount_range, int(amount_steps)),
+            )
+            elapsed = time.perf_counter() - start
+            st.caption(f"Scored {len(grid):,} scenarios in one call ({elapsed * 1000:.0f} ms)")
+
+            # Decision boundary: smallest approved income per loan amount, one line per duration
+            boundary = approval_boundary(grid).T  # Loan amounts as rows, durations as columns
+            boundary.columns = [dur_display[DURATIONS.index(int(t))] for t in boundary.columns]
+            st.plotly_chart(px.line(
+                boundary, labels={"value": "Lowest approved income ($)", "LoanAmount": "Loan amount", "variable": "Duration"},
+                title="Approval boundary",
+            ))
+
+            # Approval probability over income and loan amount for the selected duration
+            selected = grid[grid["Loan_Amount_Term"] == DURATIONS[dur]]
+            heatmap = selected.pivot(index="LoanAmount", columns="ApplicantIncome", values="probability")
+            st.plotly_chart(px.imshow(
+                heatmap, origin="lower", aspect="auto", zmin=0, zmax=1, color_continuous_scale="RdYlGn",
+                labels={"x": "Applicant income ($)", "y": "Loan amount", "color": "Approval probability"},
+                title=f"Approval probability ({dur_display[dur]})",
+            ))
+
 # Run the Streamlit app by calling the run() function
 run()
\ No newline at end of file
@@ -0,0 +1,5 @@
+import os  # For the project root
+import sys  # For importing the project's top-level modules
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # Project root (train.csv, test.csv, modules)
+sys.path.insert(0, ROOT)
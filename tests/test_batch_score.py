@@ -0,0 +1,53 @@
+import os  # For paths of the example data
+import pandas as pd  # For reading the scored output
+import pytest  # For skipping without the optional Parquet dependency
+from batch_score import score_file  # Chunked batch scorer under test
+from model_registry import load_model  # For scoring the whole file at once
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TRAIN_CSV = os.path.join(ROOT, "train.csv")
+MODEL = os.path.join(ROOT, "my_model_1.pkl")  # Saved pipeline with string-encoded categorical columns
+
+
+def test_parquet_output_with_small_chunks(tmp_path):
+    # CoapplicantIncome looks like integers in the first 7 rows and has decimals later;
+    # every chunk must still be written with the first chunk's schema
+    pytest.importorskip("pyarrow")
+    out = tmp_path / "scored.parquet"
+    stats = score_file(TRAIN_CSV, str(out), model_path=MODEL, chunksize=7)
+    scored = pd.read_parquet(out)
+    assert stats["rows"] == len(scored) == len(pd.read_csv(TRAIN_CSV))
+    assert scored["CoapplicantIncome"].dtype == "float64"
+
+
+def test_chunked_scores_match_one_batch(tmp_path):
+    out = tmp_path / "scored.csv"
+    score_file(TRAIN_CSV, str(out), model_path=MODEL, chunksize=50)
+    model = load_model(MODEL)
+    expected = model.predict_proba(pd.read_csv(TRAIN_CSV)[list(model.feature_names_in_)])
+    scored = pd.read_csv(out)
+    assert (scored["proba_Y"] - expected[:, 1]).abs().max() < 1e-9
+
+
+def test_numeric_coded_input_matches_training(tmp_path, monkeypatch):
+    # Training reads numeric codes as category labels (Gender 1 -> "Male"); the scorer must
+    # do the same, or the encoder treats every categorical value as unknown
+    from auto_ml import auto_train_model
+    from loan_schema import coerce_loans, read_loans, to_codes
+    monkeypatch.chdir(tmp_path)  # Keep the trained model out of the project's registry
+    to_codes(read_loans(TRAIN_CSV)).to_csv("coded.csv", index=False)
+    pipeline, _ = auto_train_model(full_path="coded.csv", target_column="Loan_Status", model_name="coded")
+    score_file("coded.csv", "scored.csv", model_path="coded", chunksize=100)
+    scored = pd.read_csv("scored.csv")
+    expected = pipeline.predict_proba(coerce_loans(pd.read_csv("coded.csv")).drop(columns=["Loan_Status"]))
+    assert (scored["proba_Y"] - expected[:, 1]).abs().max() < 1e-6
+    assert scored["Gender"].dropna().isin([0, 1]).all()  # Output keeps the input values
+    # The saved pipeline itself accepts the file it was trained on, so every caller gets the same answer
+    raw = pd.read_csv("coded.csv").drop(columns=["Loan_Status"])
+    assert abs(pipeline.predict_proba(raw) - expected).max() < 1e-6
+    assert list(pipeline.classes_) == ["N", "Y"]  # Coded targets are read as labels too
+    from what_if import what_if_grid
+    applicant = raw.iloc[0].to_dict()
+    grid = what_if_grid(pipeline, applicant, [1000, 5000], [100, 200])
+    labelled = what_if_grid(pipeline, coerce_loans(raw.head(1)).iloc[0].to_dict(), [1000, 5000], [100, 200])
+    assert (grid["probability"] - labelled["probability"]).abs().max() < 1e-6
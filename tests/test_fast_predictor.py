@@ -0,0 +1,59 @@
+import io  # For in-memory CSVs
+import os  # For paths of the example data
+import numpy as np  # For comparing probabilities
+import pandas as pd  # For reading the example data
+import pytest  # For fixtures and parametrization
+from auto_ml import auto_train_model  # For training the pipelines to compile
+from fast_predictor import check_equivalence, compile_pipeline, load_fast_predictor  # Compiler under test
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA = [os.path.join(ROOT, "train.csv"), os.path.join(ROOT, "test.csv")]
+MODES = {
+    "standard": {},  # LogisticRegression
+    "streaming": {"streaming": True, "chunksize": 200, "epochs": 3},  # SGDClassifier fitted chunk by chunk
+}
+
+
+@pytest.fixture(scope="module", params=sorted(MODES))
+def pipeline(request):
+    pipeline, _ = auto_train_model(full_path=DATA[0], target_column="Loan_Status", **MODES[request.param])
+    return pipeline
+
+
+def test_batch_probabilities_match(pipeline):
+    fast = compile_pipeline(pipeline)
+    assert check_equivalence(pipeline, fast, DATA) <= 1e-9  # Batch, first 50 single rows and classes
+
+
+def test_every_single_row_matches(pipeline):
+    fast = compile_pipeline(pipeline)
+    features = list(pipeline.feature_names_in_)
+    for path in DATA:
+        X = pd.read_csv(path)[features]
+        expected = pipeline.predict_proba(X)
+        records = X.to_dict(orient="records")
+        got = np.vstack([fast.predict_proba(record) for record in records])
+        assert np.abs(got - expected).max() <= 1e-9
+        assert (fast.predict(X) == pipeline.predict(X)).all()
+
+
+def test_saved_predictor_matches(pipeline, tmp_path):
+    fast = compile_pipeline(pipeline)
+    path = tmp_path / "fast.pkl"
+    fast.save(path)
+    X = pd.read_csv(DATA[1])[list(pipeline.feature_names_in_)]
+    assert np.abs(load_fast_predictor(path).predict_proba(X) - fast.predict_proba(X)).max() == 0
+
+
+def test_numeric_codes_match_labels(pipeline):
+    # The pipeline's schema step maps numeric codes to labels; the compiled predictor must too
+    from loan_schema import read_loans, to_codes
+    fast = compile_pipeline(pipeline)
+    features = list(pipeline.feature_names_in_)
+    labelled = read_loans(DATA[0])[features]
+    coded = pd.read_csv(io.StringIO(to_codes(labelled).to_csv(index=False)))  # Codes as read from a CSV
+    expected = pipeline.predict_proba(labelled)
+    assert np.abs(pipeline.predict_proba(coded) - expected).max() <= 1e-6
+    assert np.abs(fast.predict_proba(coded) - expected).max() <= 1e-6
+    for record, row in zip(coded.head(50).to_dict(orient="records"), expected[:50]):
+        assert np.abs(fast.predict_proba(record)[0] - row).max() <= 1e-6
@@ -0,0 +1,71 @@
+import io  # For in-memory CSVs
+import os  # For paths of the example data
+import numpy as np  # For comparing codes
+import pandas as pd  # For building frames
+import pytest  # For error checks
+from loan_schema import CATEGORIES, check_application, coerce_loans, read_loans, to_codes, to_labels, validate_application
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TRAIN_CSV = os.path.join(ROOT, "train.csv")
+
+
+def test_labels_and_codes_load_to_the_same_frame():
+    labelled = read_loans(TRAIN_CSV)
+    coded = read_loans(io.StringIO(to_codes(labelled).to_csv(index=False)))
+    for col in CATEGORIES:
+        assert list(coded[col].cat.categories) == CATEGORIES[col]  # Category order is the code order
+        pd.testing.assert_series_equal(coded[col], labelled[col])
+    assert coded["LoanAmount"].dtype == "float32"
+
+
+def test_to_codes_round_trip():
+    df = read_loans(TRAIN_CSV)
+    codes = to_codes(df)
+    assert codes["Gender"].dropna().isin([0, 1]).all()
+    pd.testing.assert_frame_equal(coerce_loans(codes), df)
+
+
+def test_coerce_leaves_foreign_columns_alone():
+    df = pd.DataFrame({"Gender": ["M", "F"], "Other": [1, 2]})
+    out = coerce_loans(df)
+    assert list(out["Gender"]) == ["M", "F"]
+    with pytest.raises(ValueError, match="Gender"):
+        coerce_loans(df, strict=True)
+
+
+def test_to_labels_maps_value_by_value():
+    df = pd.DataFrame({"Gender": ["1", "0", "male", None], "Dependents": [3, 0, 1, 2], "Loan_ID": ["a", "b", "c", "d"]})
+    out = to_labels(df)
+    assert list(out["Gender"][:3]) == ["Male", "Female", "male"]  # Unknown values are kept
+    assert pd.isna(out["Gender"][3])
+    assert list(out["Dependents"]) == ["3+", "0", "1", "2"]
+    assert list(out["Loan_ID"]) == ["a", "b", "c", "d"]
+
+
+@pytest.mark.parametrize("field, value, message", [
+    ("ApplicantIncome", -1, "cannot be negative"),
+    ("ApplicantIncome", "lots", "expected a number"),
+    ("Credit_History", 0.5, "must be 0 or 1"),
+    ("Loan_Amount_Term", 0, "must be positive"),
+    ("Gender", "Unknown", "unexpected value"),
+])
+def test_validate_application_rejects(field, value, message):
+    application = {"Gender": 1, "Married": "Yes", "ApplicantIncome": 5000, "Credit_History": 1, "Loan_Amount_Term": 360}
+    application[field] = value
+    with pytest.raises(ValueError, match=message):
+        validate_application(application)
+
+
+def test_validate_application_returns_schema_form():
+    df = validate_application({"Gender": 1, "Dependents": 3, "ApplicantIncome": 5000})
+    assert df["Gender"].iloc[0] == "Male" and df["Dependents"].iloc[0] == "3+"
+    assert np.isclose(df["ApplicantIncome"].iloc[0], 5000)
+
+
+def test_check_application_allows_missing_when_asked():
+    application = {"Gender": None, "ApplicantIncome": float("nan"), "LoanAmount": "120", "Dependents": "3+"}
+    check_application(application, allow_missing=True)  # The pipeline imputes missing values
+    with pytest.raises(ValueError, match="Gender is required"):
+        check_application(application)
+    with pytest.raises(ValueError, match="unexpected value"):
+        check_application({"Married": ["Yes"]}, allow_missing=True)
@@ -0,0 +1,65 @@
+import multiprocessing as mp  # For saving from several processes at once
+import os  # For paths of the example data
+import joblib  # For writing a loose model file
+import numpy as np  # For checking memory-mapped arrays
+import pytest  # For the expected errors
+from auto_ml import auto_train_model  # For a real pipeline saved with mmap=True
+from loan_schema import read_loans  # Typed test data
+from model_registry import ModelRegistry, get_registry, load_model  # Registry under test
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _save_many(root, prefix, n):
+    registry = ModelRegistry(root)
+    for i in range(n):
+        registry.save(f"{prefix}-{i}", {"model": prefix, "i": i})  # Any picklable object will do
+
+
+def test_concurrent_saves_keep_every_entry(tmp_path):
+    # Processes saving to the same registry must not drop each other's index entries
+    root = str(tmp_path / "models")
+    ctx = mp.get_context("spawn")
+    procs = [ctx.Process(target=_save_many, args=(root, f"p{j}", 25)) for j in range(4)]
+    for proc in procs:
+        proc.start()
+    for proc in procs:
+        proc.join()
+        assert proc.exitcode == 0
+    names = {entry["name"] for entry in ModelRegistry(root).list()}
+    assert names == {f"p{j}-{i}" for j in range(4) for i in range(25)}
+
+
+def test_load_by_name_after_save(tmp_path):
+    registry = ModelRegistry(str(tmp_path / "models"))
+    registry.save("m", {"weights": [1, 2, 3]}, metrics={"accuracy": 0.5})
+    registry.clear_cache()
+    assert registry.load("m") == {"weights": [1, 2, 3]}
+    assert registry.get("m")["metrics"] == {"accuracy": 0.5}
+
+
+def test_names_cannot_shadow_loose_pickles(tmp_path, monkeypatch):
+    # A registered "model" used to take precedence over model.pkl in load("model")
+    monkeypatch.chdir(tmp_path)
+    joblib.dump({"loose": True}, "model.pkl")
+    registry = ModelRegistry("models")
+    with pytest.raises(ValueError, match="model.pkl"):
+        registry.save("model", {"loose": False})
+    with pytest.raises(ValueError, match=r"\.pkl"):
+        registry.save("other.pkl", {"loose": False})
+    assert registry.list() == []
+    assert registry.load("model.pkl") == {"loose": True}
+
+
+def test_mmap_models_map_their_category_tables(tmp_path, monkeypatch):
+    # Object arrays can't be memory-mapped, so mmap=True models store categories as fixed-width strings
+    monkeypatch.chdir(tmp_path)  # Registry under tmp_path/models
+    train_csv = os.path.join(ROOT, "train.csv")
+    pipeline, _ = auto_train_model(full_path=train_csv, target_column="Loan_Status", model_name="mapped", mmap=True)
+    get_registry().clear_cache()
+    model = load_model("mapped")
+    cat = model.named_steps["prep"].named_transformers_["cat"]
+    assert all(isinstance(c, np.memmap) for c in cat.named_steps["onehot"].categories_)
+    assert isinstance(cat.named_steps["imputer"].statistics_, np.memmap)
+    X = read_loans(os.path.join(ROOT, "test.csv"))
+    assert (model.predict(X) == pipeline.predict(X)).all()
@@ -0,0 +1,38 @@
+import multiprocessing  # For checking that no search workers outlive the call
+import os  # For paths of the example data
+import time  # For timing the budget
+import pytest  # For the expected error
+from sklearn.ensemble import RandomForestClassifier  # Deliberately slow candidate
+from sklearn.linear_model import LogisticRegression  # Fast candidates with close scores
+from auto_ml import build_preprocessor, search_models  # Model search under test
+from loan_schema import NUMERIC, read_loans  # Typed training data
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TRAIN_CSV = os.path.join(ROOT, "train.csv")
+
+
+def _training_data():
+    df = read_loans(TRAIN_CSV).dropna(subset=["Loan_Status"])
+    X, y = df.drop(columns=["Loan_Status", "Loan_ID"]), df["Loan_Status"]
+    num_cols = [c for c in X.columns if c in NUMERIC]
+    return X, y, build_preprocessor(num_cols, [c for c in X.columns if c not in NUMERIC])
+
+
+def test_fully_scored_candidates_are_not_pruned():
+    # With no margin, candidates trailing the best after the last fold used to be reported as pruned
+    X, y, preprocessor = _training_data()
+    candidates = [("lr", LogisticRegression(max_iter=1000), {"C": [0.001, 0.01, 0.1, 1.0]})]
+    _, leaderboard = search_models(X, y, preprocessor, candidates=candidates, cv=3, prune_margin=0.0, n_jobs=2)
+    for row in leaderboard:
+        assert (row["status"] == "complete") == (row["folds"] == 3), row
+    assert sum(row["status"] == "complete" for row in leaderboard) > 1
+
+
+def test_time_budget_stops_running_fits():
+    X, y, preprocessor = _training_data()
+    candidates = [("rf", RandomForestClassifier(n_estimators=3000, random_state=0), {})]
+    start = time.perf_counter()
+    with pytest.raises(ValueError, match="time budget"):
+        search_models(X, y, preprocessor, candidates=candidates, cv=2, time_budget=1, n_jobs=2)
+    assert time.perf_counter() - start < 5
+    assert multiprocessing.active_children() == []  # The slow fits were stopped, not left running
@@ -0,0 +1,82 @@
+import multiprocessing as mp  # For writing to one log from several processes
+import os  # For paths of the example data
+import sqlite3  # For the errors flush re-raises
+import pandas as pd  # For comparing counters
+import pytest  # For error checks
+from prediction_log import PredictionLog, count_categories, import_csv, read_aggregates, read_log, rebuild_aggregates
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PREDICTED_CSV = os.path.join(ROOT, "predicted_data.csv")
+
+
+def _sorted(df):
+    out = df.assign(value=df["value"].astype(float)).sort_values(["column", "value"]).reset_index(drop=True)
+    return out.astype({"approved": "int64", "total": "int64", "loan_amount": "float64"})
+
+
+def _assert_counters_match_log(path):
+    # The materialized counters equal a full recount of the logged rows
+    expected = count_categories(read_log(path))
+    pd.testing.assert_frame_equal(_sorted(read_aggregates(path)), _sorted(expected), check_exact=False)
+
+
+def test_imported_csv_counters_match_recount(tmp_path):
+    path = str(tmp_path / "log.db")
+    log = PredictionLog(path, flush_interval=0)
+    imported = import_csv(PREDICTED_CSV, log, chunksize=7)
+    log.close()
+    assert imported == len(read_log(path)) > 0
+    _assert_counters_match_log(path)
+
+
+def _write_rows(path, offset, n):
+    log = PredictionLog(path, flush_size=10, flush_interval=0)
+    for i in range(offset, offset + n):
+        log.append({
+            "Gender": i % 2, "Married": (i // 2) % 2, "Dependents": i % 4, "Education": i % 2,
+            "Self_Employed": 0, "ApplicantIncome": 1000 + i, "CoapplicantIncome": 0.0,
+            "LoanAmount": float(i % 300), "Loan_Amount_Term": 360.0, "Credit_History": 1.0,
+            "Property_Area": i % 3, "Loan_Status": i % 3 != 0,
+        })
+    log.close()
+
+
+def test_concurrent_writers_lose_nothing(tmp_path):
+    path = str(tmp_path / "log.db")
+    PredictionLog(path, flush_interval=0).close()  # Create the tables before the writers start
+    ctx = mp.get_context("spawn")
+    procs = [ctx.Process(target=_write_rows, args=(path, j * 1000, 500)) for j in range(2)]
+    for proc in procs:
+        proc.start()
+    for proc in procs:
+        proc.join()
+        assert proc.exitcode == 0
+    logged = read_log(path)
+    assert len(logged) == 1000
+    counters = read_aggregates(path)
+    assert counters[counters["column"] == "Gender"]["total"].sum() == 1000
+    _assert_counters_match_log(path)
+
+
+def test_failed_flush_keeps_the_rows(tmp_path):
+    path = str(tmp_path / "log.db")
+    log = PredictionLog(path, flush_interval=0)
+    log.append({"Gender": 1, "Loan_Status": 1})
+    log.append({"Gender": {"not": "bindable"}, "Loan_Status": 1})
+    with pytest.raises(sqlite3.Error):
+        log.flush()
+    assert len(log._buffer) == 2  # Not silently dropped
+    log._buffer.pop()  # Remove the bad row; the good one is still written
+    assert log.flush() == 1
+    log.close()
+    assert len(read_log(path)) == 1
+
+
+def test_rebuild_matches_incremental_counters(tmp_path):
+    path = str(tmp_path / "log.db")
+    log = PredictionLog(path, flush_interval=0)
+    import_csv(PREDICTED_CSV, log)
+    incremental = _sorted(read_aggregates(path))
+    rebuild_aggregates(log._conn)
+    log.close()
+    pd.testing.assert_frame_equal(_sorted(read_aggregates(path)), incremental, check_exact=False)
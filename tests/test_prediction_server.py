@@ -0,0 +1,91 @@
+import asyncio  # For running the batcher's event loop
+import json  # For request bodies
+import os  # For paths of the example data
+import pandas as pd  # For building requests from train.csv
+import pytest  # For the batcher's error propagation
+from model_registry import load_model  # For loading the example pipeline
+from prediction_server import MicroBatcher, PredictionServer  # Service under test
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODEL = os.path.join(ROOT, "my_model_1.pkl")
+
+
+def _applications(n):
+    # First n applications of test.csv as JSON-like dicts (missing values as None)
+    df = pd.read_csv(os.path.join(ROOT, "test.csv")).head(n)
+    return [{k: (None if pd.isna(v) else v) for k, v in r.items()} for r in df.to_dict(orient="records")]
+
+
+def _run(coro_fn, model=None):
+    # Run coro_fn(server) with a started batcher whose window is long enough to batch everything
+    async def main():
+        batcher = MicroBatcher(model or load_model(MODEL), batch_window=0.05)
+        batcher.start()
+        try:
+            return await coro_fn(PredictionServer(batcher)), batcher
+        finally:
+            await batcher.stop()
+    return asyncio.run(main())
+
+
+def test_bad_request_does_not_fail_its_batch():
+    good = _applications(2)
+    bad = dict(good[0], ApplicantIncome="lots")
+
+    async def requests(server):
+        bodies = [json.dumps(r).encode() for r in (good[0], bad, good[1])]
+        return await asyncio.gather(*(server.handle("/predict", "POST", b) for b in bodies))
+
+    responses, batcher = _run(requests)
+    assert [status for status, _ in responses] == [200, 400, 200]
+    assert "ApplicantIncome" in responses[1][1]["error"]
+    assert batcher.rows == 2
+
+
+def test_failed_batch_is_scored_row_by_row():
+    # A record that fails in the pipeline only fails its own request
+    good = _applications(2)
+    bad = dict(good[0], ApplicantIncome="lots")  # Bypasses the server's validation
+
+    async def predict(server):
+        return await asyncio.gather(*(server.batcher.predict(r) for r in (good[0], bad, good[1])), return_exceptions=True)
+
+    results, batcher = _run(predict)
+    assert isinstance(results[1], Exception)
+    assert all(isinstance(r, dict) and "prediction" in r for r in (results[0], results[2]))
+    assert batcher.batches == 1
+
+
+def test_batched_results_match_one_by_one():
+    apps = _applications(5)
+
+    async def predict(server):
+        return await asyncio.gather(*(server.batcher.predict(r) for r in apps))
+
+    results, batcher = _run(predict)
+    assert batcher.batches == 1
+    singles = [_run(lambda server, app=app: server.batcher.predict(app))[0] for app in apps]
+    for batched, single in zip(results, singles):
+        assert batched["prediction"] == single["prediction"]
+        assert batched["proba_Y"] == pytest.approx(single["proba_Y"])
+
+
+def test_numeric_codes_score_like_labels():
+    # Applications may use the numeric codes of the loan schema (as the predictor form does);
+    # the schema step of a newly trained pipeline converts them to the labels it was trained on
+    from auto_ml import auto_train_model
+    model, _ = auto_train_model(full_path=os.path.join(ROOT, "train.csv"), target_column="Loan_Status")
+    labels = _applications(3)
+    codes = [
+        dict(app, Gender=1, Married=1, Dependents=0, Education=1, Self_Employed=0, Property_Area=2)
+        for app in labels
+    ]
+    for app in labels:
+        app.update(Gender="Male", Married="Yes", Dependents="0", Education="Graduate", Self_Employed="No", Property_Area="Urban")
+
+    async def predict(server):
+        return await asyncio.gather(*(server.batcher.predict(r) for r in labels + codes))
+
+    results, _ = _run(predict, model)
+    for by_label, by_code in zip(results[:3], results[3:]):
+        assert by_code["proba_Y"] == pytest.approx(by_label["proba_Y"])
@@ -0,0 +1,47 @@
+import os  # For paths of the example data
+import numpy as np  # For comparing fitted statistics
+import pytest  # For parametrization
+from auto_ml import build_preprocessor, stream_train_model  # Streaming trainer under test
+from loan_schema import read_loans  # Same typed read as in-memory training
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TRAIN_CSV = os.path.join(ROOT, "train.csv")
+TEST_CSV = os.path.join(ROOT, "test.csv")
+
+
+def _dense(matrix):
+    return matrix.toarray() if hasattr(matrix, "toarray") else matrix
+
+
+@pytest.mark.parametrize("chunksize", [7, 100, 10_000])
+def test_streamed_statistics_match_in_memory_fit(chunksize):
+    # With a separate test file every train.csv row is a training row, so the preprocessor fitted
+    # from the per-chunk statistics must equal one fitted on the whole file, for any chunk size
+    pipeline, _ = stream_train_model(
+        train_path=TRAIN_CSV, test_path=TEST_CSV, target_column="Loan_Status", chunksize=chunksize, epochs=1,
+    )
+    streamed = pipeline.named_steps["prep"]
+    columns = {name: cols for name, _, cols in streamed.transformers_}
+    num_cols, cat_cols = columns["num"], columns["cat"]
+    X = read_loans(TRAIN_CSV).drop(columns=["Loan_Status"])
+    reference = build_preprocessor(num_cols, cat_cols).fit(X)
+
+    for name in ("num", "cat"):
+        got, expected = streamed.named_transformers_[name], reference.named_transformers_[name]
+        if name == "num":
+            np.testing.assert_allclose(got["imputer"].statistics_, expected["imputer"].statistics_, rtol=1e-6)
+            np.testing.assert_allclose(got["scale"].mean_, expected["scale"].mean_, rtol=1e-6)
+            np.testing.assert_allclose(got["scale"].var_, expected["scale"].var_, rtol=1e-5)
+        else:
+            assert list(got["imputer"].statistics_) == list(expected["imputer"].statistics_)
+            assert [list(c) for c in got["onehot"].categories_] == [list(c) for c in expected["onehot"].categories_]
+    X_test = read_loans(TEST_CSV)
+    np.testing.assert_allclose(_dense(streamed.transform(X_test)), _dense(reference.transform(X_test)), rtol=1e-5, atol=1e-5)
+
+
+def test_loan_id_is_dropped():
+    # Identifier-like columns are profiled away from the streamed counts as well
+    pipeline, metrics = stream_train_model(full_path=TRAIN_CSV, target_column="Loan_Status", chunksize=100, epochs=1)
+    assert metrics["column_profile"]["dropped"] == ["Loan_ID"]
+    encoded = [c for name, _, cols in pipeline.named_steps["prep"].transformers_ if name != "remainder" for c in cols]
+    assert "Loan_ID" not in encoded
@@ -0,0 +1,97 @@
+import os  # For paths of the example data
+import sys  # For the platform check
+import time  # For polling the process table
+import pytest  # For skipping off Linux
+from sklearn.ensemble import RandomForestClassifier  # Deliberately slow search candidate
+import instrumentation  # The app's metrics registry
+from training_jobs import STAGES, TrainingJobQueue  # Queue under test
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TRAIN_CSV = os.path.join(ROOT, "train.csv")
+
+
+def _runs(registry):
+    # loan_training_runs_total over all modes
+    return sum(v for (name, _), v in registry.snapshot()["counters"].items() if name == "loan_training_runs_total")
+
+
+def test_job_reports_stages_metrics_and_training_metrics(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # Workers start here, so the model registry is created under tmp_path
+    jobs = TrainingJobQueue(max_workers=1)
+    try:
+        before = _runs(instrumentation.REGISTRY)
+        with open(TRAIN_CSV, "rb") as f:
+            job_id = jobs.submit(files={"full_path": f.read()}, target_column="Loan_Status", model_name="job")
+        status = jobs.wait(job_id, timeout=120)
+        assert status["status"] == "done", status["error"]
+        assert [stage for stage, _ in status["stages"]] == STAGES
+        assert status["metrics"]["accuracy"] > 0.5 and os.path.exists(status["metrics"]["model_path"])
+        # The worker's stage timings and run count are merged into the app's registry
+        assert _runs(instrumentation.REGISTRY) == before + 1
+        assert 'loan_training_stage_seconds_count{mode="standard",stage="fit"}' in instrumentation.REGISTRY.render()
+    finally:
+        jobs.shutdown()
+
+
+def test_failed_and_cancelled_jobs(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    jobs = TrainingJobQueue(max_workers=1)
+    try:
+        failing = jobs.submit(full_path=TRAIN_CSV, target_column="no_such_column")
+        queued = jobs.submit(full_path=TRAIN_CSV, target_column="Loan_Status")  # Waits for the single worker
+        assert jobs.cancel(queued)
+        assert jobs.status(queued)["status"] == "cancelled"
+        status = jobs.wait(failing, timeout=120)
+        assert status["status"] == "failed" and "no_such_column" in status["error"]
+        assert not jobs.cancel(failing)  # Already finished
+    finally:
+        jobs.shutdown()
+
+
+def _live_group_members(pgid):
+    # Pids of running (non-zombie) processes in a process group, from /proc
+    pids = []
+    for pid in filter(str.isdigit, os.listdir("/proc")):
+        try:
+            with open(f"/proc/{pid}/stat") as f:
+                fields = f.read().rsplit(")", 1)[1].split()
+        except OSError:
+            continue  # Exited meanwhile
+        if fields[0] != "Z" and int(fields[2]) == pgid:  # state, ppid, pgrp
+            pids.append(int(pid))
+    return pids
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="reads /proc")
+def test_killed_search_job_leaves_no_workers(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    jobs = TrainingJobQueue(max_workers=2, cancel_grace=0.5)
+    try:
+        candidates = [("rf", RandomForestClassifier(n_estimators=5000, random_state=0), {})]
+        job_id = jobs.submit(full_path=TRAIN_CSV, target_column="Loan_Status", search=True, cv=2, candidates=candidates)
+        assert jobs._jobs[job_id]["_params"]["n_jobs"] == max(1, (os.cpu_count() or 1) // 2)  # Cores shared by 2 jobs
+        deadline = time.monotonic() + 60
+        while jobs.status(job_id)["stage"] != "fitting" and time.monotonic() < deadline:
+            time.sleep(0.1)
+        pgid = jobs._procs[job_id][0].pid
+        time.sleep(1)  # Let the search pool start its fits
+        assert len(_live_group_members(pgid)) > 1  # The job worker and its search workers
+        assert jobs.cancel(job_id)  # Stuck in a long fold, so it is killed after the grace period
+        assert jobs.wait(job_id, timeout=30)["status"] == "cancelled"
+        assert _live_group_members(pgid) == []
+    finally:
+        jobs.shutdown()
+
+
+def test_merge_adds_counters_and_histograms():
+    worker, app = instrumentation.MetricsRegistry(), instrumentation.MetricsRegistry()
+    for registry in (worker, app):
+        registry.inc("runs", mode="standard")
+        registry.observe("seconds", 0.2, stage="fit")
+    worker.set_max("peak", 10)
+    app.set_max("peak", 5)
+    app.merge(worker.snapshot())
+    snapshot = app.snapshot()
+    assert snapshot["counters"][("runs", (("mode", "standard"),))] == 2
+    assert snapshot["histograms"][("seconds", (("stage", "fit"),))][-1] == 2  # Observation count
+    assert snapshot["gauges"][("peak", ())] == 10
@@ -0,0 +1,261 @@
+import atexit  # For stopping workers when the app exits
+import multiprocessing as mp  # For running training jobs in separate worker processes
+import os  # For the per-job working directories
+import queue  # For draining worker events without blocking
+import shutil  # For removing job directories
+import signal  # For killing a worker's process group
+import tempfile  # For the uploaded files of a job
+import threading  # For the scheduler thread and the job table lock
+import time  # For timestamps and result retention
+import uuid  # For job ids
+from collections import OrderedDict  # Jobs in submission order
+import instrumentation  # Training metrics of the workers are merged into this process's registry
+
+# Stages reported by auto_train_model through its progress callback, in order
+STAGES = ["loading", "preprocessing", "fitting", "evaluating", "saving"]
+FINISHED = ("done", "failed", "cancelled")  # Final job states
+
+
+class JobCancelled(Exception):
+    # Raised inside the worker at the next stage boundary after a cancel request
+    pass
+
+
+def _run_job(job_id, params, events, cancel):
+    # Worker process: train, reporting every stage; stops at the next stage once cancelled.
+    # The metrics recorded while training (stage timings, run counts) are sent back before
+    # the final event, since this process's registry goes away with it.
+    if hasattr(os, "setsid"):  # Own process group, shared with the model search's workers (see _kill)
+        os.setsid()
+    import instrumentation
+    from auto_ml import auto_train_model
+
+    def progress(stage):
+        if cancel.is_set():
+            raise JobCancelled()
+        events.put((job_id, "stage", (stage, time.time())))
+
+    try:
+        _, metrics = auto_train_model(progress=progress, **params)
+        final = (job_id, "done", metrics)  # The model itself is in the model registry
+    except JobCancelled:
+        final = (job_id, "cancelled", None)
+    except Exception as exc:  # Reported to the page instead of killing the queue
+        final = (job_id, "failed", f"{type(exc).__name__}: {exc}")
+    events.put((job_id, "metrics", instrumentation.REGISTRY.snapshot()))
+    events.put(final)
+
+
+def _kill(proc):
+    # Kill a job worker together with the processes it started (the model search pool);
+    # killing only the worker would leave those running as orphans
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except (AttributeError, ProcessLookupError, PermissionError):  # No killpg, or setsid not reached yet
+        proc.kill()
+    proc.join()
+
+
+class TrainingJobQueue:
+    # Local background training queue. Every job runs auto_train_model in its own worker
+    # process (at most max_workers at a time), so the Streamlit server thread never blocks
+    # and a running job can be stopped. Finished jobs are kept for result_ttl seconds
+    # (and at most max_finished of them) so pages can poll for their results.
+    def __init__(self, max_workers=2, result_ttl=3600.0, max_finished=50, cancel_grace=10.0):
+        self.max_workers = max_workers  # Jobs training at the same time
+        self.result_ttl = result_ttl  # Seconds a finished job stays available
+        self.max_finished = max_finished  # Finished jobs kept at most
+        self.cancel_grace = cancel_grace  # Seconds to stop at a stage boundary before the worker is killed
+        self._ctx = mp.get_context("spawn")  # Fresh interpreters; safe next to Streamlit's threads
+        self._events = self._ctx.Queue()  # (job_id, kind, payload) from the workers
+        self._jobs = OrderedDict()  # job_id -> job record
+        self._procs = {}  # job_id -> (process, cancel event) of running jobs
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._scheduler = threading.Thread(target=self._schedule, daemon=True)
+        self._scheduler.start()
+        atexit.register(self.shutdown)  # Don't keep the app from exiting while jobs are running
+
+    def submit(self, files=None, **params):
+        # Queue a training run and return its job id straight away. `params` are passed to
+        # auto_train_model; `files` maps its path arguments ("full_path", "train_path",
+        # "test_path") to file contents, written to a directory removed when the job ends.
+        job_id = uuid.uuid4().hex[:12]
+        workdir = None
+        if files:
+            workdir = tempfile.mkdtemp(prefix=f"training-{job_id}-")
+            for arg, data in files.items():
+                path = os.path.join(workdir, f"{arg}.csv")
+                with open(path, "wb") as f:
+                    f.write(data)
+                params[arg] = path
+        if params.get("search") and params.get("n_jobs") is None:  # Share the cores between concurrent jobs
+            params["n_jobs"] = max(1, (os.cpu_count() or 1) // self.max_workers)
+        job = {
+            "id": job_id,
+            "status": "queued",  # queued -> running -> done / failed / cancelled
+            "stage": None,  # Current stage while running
+            "stages": [],  # (stage, seconds since start) in the order reached
+            "model_name": params.get("model_name"),
+            "submitted_at": time.time(),
+            "started_at": None,
+            "finished_at": None,
+            "metrics": None,  # auto_train_model metrics once done
+            "error": None,  # Error message if failed
+            "_params": params,
+            "_workdir": workdir,
+            "_cancel_at": None,
+        }
+        with self._lock:
+            self._jobs[job_id] = job
+        self._wake.set()
+        return job_id
+
+    def status(self, job_id):
+        # Public fields of a job, or None if it is unknown or expired
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return None if job is None else {k: (list(v) if k == "stages" else v) for k, v in job.items() if not k.startswith("_")}
+
+    def jobs(self):
+        # Status of every retained job, oldest first
+        with self._lock:
+            ids = list(self._jobs)
+        return [s for s in (self.status(i) for i in ids) if s is not None]
+
+    def cancel(self, job_id):
+        # Cancel a queued job now, or stop a running one at its next stage (killed after
+        # cancel_grace seconds); returns False if the job has already finished
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job["status"] in FINISHED:
+                return False
+            if job["status"] == "queued":
+                self._finish(job, "cancelled")
+            else:
+                self._procs[job_id][1].set()
+                job["_cancel_at"] = time.monotonic()
+        self._wake.set()
+        return True
+
+    def wait(self, job_id, timeout=None):
+        # Block until the job has finished (for scripts and tests); returns its status
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            status = self.status(job_id)
+            if status is None or status["status"] in FINISHED:
+                return status
+            if deadline is not None and time.monotonic() >= deadline:
+                return status
+            time.sleep(0.1)
+
+    def shutdown(self):
+        # Stop the scheduler and kill running workers
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        self._wake.set()
+        self._scheduler.join()
+        with self._lock:
+            for job_id, (proc, _) in list(self._procs.items()):
+                _kill(proc)
+                self._finish(self._jobs[job_id], "cancelled")
+
+    def _finish(self, job, status, metrics=None, error=None):
+        # Called with the lock held
+        job["status"] = status
+        job["stage"] = None
+        job["finished_at"] = time.time()
+        job["metrics"] = metrics
+        job["error"] = error
+        self._procs.pop(job["id"], None)
+        if job["_workdir"]:
+            shutil.rmtree(job["_workdir"], ignore_errors=True)
+            job["_workdir"] = None
+
+    def _schedule(self):
+        while not self._stop.is_set():
+            self._drain_events()
+            with self._lock:
+                self._reap()
+                self._start_queued()
+                self._expire()
+            self._wake.wait(0.2)
+            self._wake.clear()
+
+    def _drain_events(self):
+        while True:
+            try:
+                job_id, kind, payload = self._events.get_nowait()
+            except queue.Empty:
+                return
+            if kind == "metrics":  # Also after a cancel: the training the worker did still counts
+                instrumentation.REGISTRY.merge(payload)
+                continue
+            with self._lock:
+                job = self._jobs.get(job_id)
+                if job is None or job["status"] in FINISHED:
+                    continue
+                if kind == "stage":
+                    stage, reached_at = payload
+                    if stage != job["stage"]:  # Model search reports "fitting" once per fold
+                        job["stage"] = stage
+                        job["stages"].append((stage, reached_at - job["started_at"]))
+                elif kind == "done":
+                    self._finish(job, "done", metrics=payload)
+                elif kind == "failed":
+                    self._finish(job, "failed", error=payload)
+                else:
+                    self._finish(job, "cancelled")
+
+    def _reap(self):
+        # Workers that exited without reporting, and cancelled workers past their grace period
+        for job_id, (proc, _) in list(self._procs.items()):
+            job = self._jobs[job_id]
+            if job["_cancel_at"] is not None and time.monotonic() - job["_cancel_at"] > self.cancel_grace:
+                _kill(proc)
+                self._finish(job, "cancelled")
+            elif not proc.is_alive() and job["status"] == "running":
+                proc.join()
+                if self._events.empty():  # Its final event, if any, would still be in the queue
+                    self._finish(job, "failed", error=f"Worker exited with code {proc.exitcode}")
+            elif not proc.is_alive():
+                proc.join()
+
+    def _start_queued(self):
+        running = sum(1 for j in self._jobs.values() if j["status"] == "running")
+        for job in self._jobs.values():
+            if running >= self.max_workers:
+                break
+            if job["status"] != "queued":
+                continue
+            cancel = self._ctx.Event()
+            # Not a daemon: the model search inside a job starts worker processes of its own
+            proc = self._ctx.Process(target=_run_job, args=(job["id"], job["_params"], self._events, cancel))
+            proc.start()
+            self._procs[job["id"]] = (proc, cancel)
+            job["status"] = "running"
+            job["started_at"] = time.time()
+            running += 1
+
+    def _expire(self):
+        # Drop finished jobs past result_ttl, and the oldest ones beyond max_finished
+        now = time.time()
+        finished = [j for j in self._jobs.values() if j["status"] in FINISHED]
+        for i, job in enumerate(finished):
+            if now - job["finished_at"] > self.result_ttl or i < len(finished) - self.max_finished:
+                del self._jobs[job["id"]]
+
+
+_queue = None  # One job queue per process
+_queue_lock = threading.Lock()
+
+
+def get_job_queue(**kwargs):
+    # Process-wide training job queue, shared by all Streamlit sessions
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = TrainingJobQueue(**kwargs)
+        return _queue
@@ -0,0 +1,49 @@
+import numpy as np  # For building the perturbation grid
+import pandas as pd  # For the model input and the results
+
+# Loan_Amount_Term values offered by the predictor form (days)
+DURATIONS = [60, 180, 240, 360, 480]
+
+
+def what_if_grid(
+    model,  # Fitted classifier or pipeline with predict_proba
+    applicant,  # Dict of feature -> value for one application
+    incomes,  # ApplicantIncome values to try
+    loan_amounts,  # LoanAmount values to try
+    durations=DURATIONS,  # Loan_Amount_Term values to try
+    positive=None,  # Class counted as approval (default: the last class, 1 or "Y")
+):
+    # Score every combination of income, loan amount and duration for one applicant with a
+    # single predict_proba call instead of one call per combination
+    incomes = np.asarray(incomes, dtype=float)
+    loan_amounts = np.asarray(loan_amounts, dtype=float)
+    durations = np.asarray(durations, dtype=float)
+    income_grid, amount_grid, term_grid = np.meshgrid(incomes, loan_amounts, durations, indexing="ij")
+    n = income_grid.size
+    varied = {
+        "ApplicantIncome": income_grid.ravel(),
+        "LoanAmount": amount_grid.ravel(),
+        "Loan_Amount_Term": term_grid.ravel(),
+    }
+
+    # Every other feature is the applicant's value, repeated (same column order as in training)
+    columns = list(model.feature_names_in_) if hasattr(model, "feature_names_in_") else list(applicant)
+    X = pd.DataFrame({col: varied[col] if col in varied else np.repeat(applicant[col], n) for col in columns})
+
+    proba = model.predict_proba(X)  # One vectorized pass over the whole grid
+    classes = list(model.classes_)
+    positive_idx = classes.index(positive) if positive is not None else len(classes) - 1
+    grid = pd.DataFrame(varied)
+    grid["probability"] = proba[:, positive_idx]  # Approval probability
+    grid["approved"] = np.argmax(proba, axis=1) == positive_idx  # Same decision rule as predict()
+    return grid
+
+
+def approval_boundary(grid):
+    # Smallest applicant income that gets approved for each duration (rows) and loan amount
+    # (columns); NaN where no income in the grid is approved
+    approved = grid[grid["approved"]]
+    boundary = approved.groupby(["Loan_Amount_Term", "LoanAmount"])["ApplicantIncome"].min().unstack()
+    terms = np.unique(grid["Loan_Amount_Term"])
+    amounts = np.unique(grid["LoanAmount"])
+    return boundary.reindex(index=terms, columns=amounts)